@@ -1,5 +1,10 @@
 from .events import *
+from .spriteCache import *
 from .spriteManager import *
 from .soundManager import *
+from .wordStore import *
 from .wordManager import *
-from .hud import *
\ No newline at end of file
+from .hud import *
+from .renderQueue import *
+from .dirtyRenderer import *
+from .presenter import *
\ No newline at end of file
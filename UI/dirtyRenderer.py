@@ -0,0 +1,172 @@
+import pygame
+from collections import Counter
+from pygame import Rect
+
+"""
+Dirty-rectangle rendering.
+
+Instead of blitting straight to the draw surface, a frame is drawn
+into a FrameRecorder, which only notes each blit and the rect it
+covers. The DirtyRenderer compares that list with the last frame's:
+a blit that appeared, disappeared, moved, or changed surface or alpha
+marks its old and new rects dirty. Only those rects are redrawn,
+presented through the Presenter and pushed with
+pygame.display.update(rects), so the work per frame follows what
+moved instead of the screen size.
+"""
+
+class FrameRecorder(object):
+    """
+    Stands in for the draw surface while a frame is drawn.
+    Records blits instead of doing them.
+    """
+
+    def __init__(self, target):
+        self.target = target
+        self.bounds = target.get_rect()
+        self.ops = []
+
+    def blit(self, source, dest, area = None, special_flags = 0):
+        """
+        Record a blit and return the rect it covers,
+        like Surface.blit.
+        """
+        if area != None:
+            area = Rect(area)
+            size = area.size
+        else:
+            size = source.get_size()
+        rect = Rect((dest[0], dest[1]), size)
+        self.ops.append((source, rect, area, special_flags))
+        return rect.clip(self.bounds)
+
+    def blits(self, sequence, doreturn = True):
+        rects = [self.blit(*blit) for blit in sequence]
+        if doreturn:
+            return rects
+
+    def get_size(self):
+        return self.target.get_size()
+
+    def get_width(self):
+        return self.target.get_width()
+
+    def get_height(self):
+        return self.target.get_height()
+
+    def get_rect(self, **kwargs):
+        return self.target.get_rect(**kwargs)
+
+
+class DirtyRenderer(object):
+    """
+    Redraws and presents only the parts of the screen
+    that changed since the last frame.
+    """
+
+    #   Past this fraction of the screen, redraw all of it
+    FULL_REDRAW = 0.5
+
+    def __init__(self, drawSurface, presenter):
+        self.drawSurface = drawSurface
+        self.presenter = presenter
+        self.bounds = drawSurface.get_rect()
+
+        self.lastOps = []
+        self.lastKeys = Counter()
+        self.lastRects = []   # (key, rect) of each blit last frame, keyed as it was then
+        self.recorder = None
+
+        #   Stats for the last frame
+        self.dirtyArea = 0
+        self.rectCount = 0
+
+    def begin(self):
+        """
+        Start a frame. Draw it into the returned recorder.
+        """
+        self.recorder = FrameRecorder(self.drawSurface)
+        return self.recorder
+
+    def getKey(op):
+        """
+        What has to match for a blit to look the same
+        as one last frame.
+        """
+        source, rect, area, flags = op
+        return (id(source), source.get_alpha(), tuple(rect),
+                tuple(area) if area else None, flags)
+
+    def findDirty(self, ops):
+        """
+        Return the rects covered by blits that are in this
+        frame or the last but not both.
+        """
+        rects = [(DirtyRenderer.getKey(op), op[1]) for op in ops]
+        keys = Counter(key for key, rect in rects)
+        changed = (keys - self.lastKeys) + (self.lastKeys - keys)
+        dirty = []
+        if changed:
+            ##  Last frame's keys are the ones it was drawn with;
+            ##  a surface's alpha may have changed since
+            for key, rect in self.lastRects + rects:
+                if key in changed:
+                    rect = rect.clip(self.bounds)
+                    if rect.w and rect.h:
+                        dirty.append(rect)
+
+        self.lastKeys = keys
+        self.lastRects = rects
+        return dirty
+
+    def merge(rects):
+        """
+        Union overlapping rects so no pixel is drawn twice.
+        """
+        merged = []
+        for rect in rects:
+            rect = rect.copy()
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect.union_ip(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def end(self):
+        """
+        Redraw the dirty parts of the frame and push them to the display.
+        Returns the screen rects that were updated.
+        """
+        ops = self.recorder.ops
+        self.recorder = None
+
+        dirty = DirtyRenderer.merge(self.findDirty(ops))
+        area = sum(r.w * r.h for r in dirty)
+        if area > self.bounds.w * self.bounds.h * DirtyRenderer.FULL_REDRAW:
+            dirty = [self.bounds.copy()]
+            area = self.bounds.w * self.bounds.h
+
+        for rect in dirty:
+            self.drawSurface.set_clip(rect)
+            self.drawSurface.blits([op for op in ops if op[1].colliderect(rect)], False)
+        self.drawSurface.set_clip(None)
+
+        #   Keep this frame's surfaces alive so their ids
+        #   can't be reused before the next comparison
+        self.lastOps = ops
+        self.dirtyArea = area
+        self.rectCount = len(dirty)
+
+        updated = self.presenter.presentRects(dirty)
+        if updated:
+            pygame.display.update(updated)
+        return updated
+
+    def getStats(self):
+        """
+        Return the dirty area and rect count of the last frame.
+        """
+        return {"dirtyArea": self.dirtyArea,
+                "rects": self.rectCount,
+                "fraction": self.dirtyArea / (self.bounds.w * self.bounds.h)}
@@ -97,10 +97,11 @@ class EventManager(object):
     
     def updateTimer(seconds, engine):
         """
-        Update the event manager's timer
+        Update the event manager's timer.
+        The logo stays up until the engine has loaded its images.
         """
         EventManager.timer += seconds
-        if EventManager.timer >= 2.0:
+        if EventManager.timer >= 2.0 and engine.loaded:
             EventManager.timer = 0.0
             EventManager.transitioning = True
             engine.fade_on = True
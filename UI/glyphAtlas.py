@@ -0,0 +1,126 @@
+"""
+Palette-indexed glyphs for colour-cycling text.
+
+chars.png stores each colour of the font as its own row.
+A GlyphAtlas merges 4 consecutive rows into one 8-bit sheet:
+each pixel's index names its colour in all 4 rows, and
+each row becomes a palette. Text is rasterized once; each colour is a copy of the
+same indices under another palette, so cycling its colour
+is picking a surface.
+"""
+
+import numpy as np
+from pygame import Surface, Rect, surfarray, transform
+from UI import SpriteManager
+
+class GlyphAtlas(object):
+   """An 8-bit font sheet for one group of 4 colour rows."""
+
+   # Number of colour rows in a cycle
+   PHASES = 4
+
+   # Glyph size in chars.png
+   GLYPH = (8,16)
+
+   # Atlases by group, built on demand
+   _INSTANCES = {}
+
+   @classmethod
+   def getInstance(cls, group):
+      if group not in cls._INSTANCES:
+         cls._INSTANCES[group] = cls(group)
+      return cls._INSTANCES[group]
+
+   def __init__(self, group):
+      manager = SpriteManager.getInstance()
+      rows = range(group * GlyphAtlas.PHASES, (group + 1) * GlyphAtlas.PHASES)
+      width, height = GlyphAtlas.GLYPH
+
+      # Make sure the sheet is loaded, then read every row's pixels
+      background = manager.getSprite("chars.png", (0, rows[0])).get_colorkey()
+      nGlyphs = len(manager["chars.png"][rows[0]])
+
+      phases = []
+      for row in rows:
+         pixels = np.concatenate([surfarray.array3d(sprite) for sprite in manager["chars.png"][row]])
+         phases.append(pixels.astype(np.uint32) @ np.array((1 << 16, 1 << 8, 1), np.uint32))
+      phases = np.stack(phases, axis=-1)
+
+      # Index 0 is transparent in every phase
+      key = np.uint32((background[0] << 16) | (background[1] << 8) | background[2])
+      colours, indices = np.unique(phases.reshape(-1, GlyphAtlas.PHASES), axis=0, return_inverse=True)
+      empty = np.all(colours == key, axis=1)
+      if len(colours) - empty.sum() > 255:
+         raise ValueError(f"Colour rows {rows[0]}-{rows[-1]} of chars.png need more than 256 colours")
+
+      remap = np.cumsum(~empty).astype(np.uint8)
+      remap[empty] = 0
+      indices = remap[indices.reshape(-1)].reshape(phases.shape[:2])
+
+      # One palette per row
+      self.palettes = []
+      for phase in range(GlyphAtlas.PHASES):
+         palette = [(0,0,0)] * 256
+         for colour, index in zip(colours[:, phase], remap):
+            if index:
+               palette[index] = ((int(colour) >> 16) & 255, (int(colour) >> 8) & 255, int(colour) & 255)
+         self.palettes.append(palette)
+
+      # A glyph can be cycled if its shape is the same in every row
+      opaque = phases != key
+      same = np.all(opaque == opaque[..., :1], axis=-1)
+      self.cyclable = same.reshape(nGlyphs, width, height).all(axis=(1, 2)).tolist()
+
+      self.sheet = Surface((nGlyphs * width, height), 0, 8)
+      self.sheet.set_palette(self.palettes[0])
+      surfarray.blit_array(self.sheet, indices)
+      self.sheet.set_colorkey((0,0,0))
+
+   def render(self, glyphs):
+      """
+      Blit (glyph index, x) pairs onto a new 8-bit surface
+      just big enough to hold them.
+      """
+      width, height = GlyphAtlas.GLYPH
+      right = max([x + width for glyph, x in glyphs], default = 0)
+
+      # One pixel of padding, like WordManager.renderText
+      surf = Surface((right + 1, height + 1), 0, 8)
+      surf.set_palette(self.palettes[0])
+      surf.set_colorkey((0,0,0))
+      surf.blits([(self.sheet, (x, 0), Rect(glyph * width, 0, width, height)) for glyph, x in glyphs], False)
+      return surf
+
+   def renderPhases(self, glyphs, scale = False):
+      """
+      Render glyphs once and return one surface per phase,
+      each sharing the same indices under that phase's palette.
+      """
+      surf = self.render(glyphs)
+      if scale:
+         surf = transform.scale2x(surf)
+
+      phases = [surf]
+      for palette in self.palettes[1:]:
+         copy = surf.copy()
+         copy.set_palette(palette)
+         phases.append(copy)
+      return phases
+
+
+class TextCycle(object):
+   """
+   Text whose colour cycles through 4 rows.
+   Holds one surface per row.
+   """
+
+   def __init__(self, surfs, length):
+      self.surfs = surfs
+      self.length = length
+
+   def getSurface(self, phase):
+      """Return the text drawn in the given phase's colours."""
+      return self.surfs[phase]
+
+   def getLength(self):
+      return self.length
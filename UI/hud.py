@@ -1,37 +1,136 @@
 from pygame import Rect, Surface, transform
 from pygame.draw import rect
-from utils import vec, RESOLUTION
 from UI import SpriteManager
 from . import WordManager
 
-class HudBuilder:
+class Hud:
+    """
+    A retained HUD.
+    Keeps its composed surface between frames and
+    only re-renders a widget when its input changes.
+    Widgets are drawn at 1x and stored scale2x'd.
+    """
+
+    def __init__(self):
+        #   Last inputs seen by each widget
+        self.hp = None
+        self.maxHp = None
+        self.killed = None
+
+        #   Scaled widget surfaces
+        self.hpBar = None
+        self.heart = None
+        self.counter = None
+
+        #   Composed surface
+        self.surf = None
+        self.dirty = True
+
+        #   Number of widget re-renders, for profiling
+        self.rebuilds = 0
+
+    def update(self, hp, maxHp, killed):
+        """
+        Re-render any widget
+        whose input value changed.
+        """
+        if maxHp != self.maxHp:
+            #   The layout depends on maxHp
+            self.maxHp = maxHp
+            self.hp = None
+            self.heart = self.buildHeart()
+            self.dirty = True
+
+        if hp != self.hp:
+            self.hp = hp
+            self.hpBar = self.buildHpBar(hp, maxHp)
+            self.dirty = True
+
+        if killed != self.killed:
+            self.killed = killed
+            self.counter = self.buildCounter(killed)
+            self.dirty = True
+
+        if self.dirty:
+            self.compose()
+
+    def buildHpBar(self, hp, maxHp):
+        """
+        Outline and green fill.
+        """
+        surf = Hud.makeWidget(maxHp + 2, 16 + 2)
 
-    def getHud(hp, maxHp, killed):
-        #   Initialize surface
-        surf = Surface(vec(*RESOLUTION))
-        surf.set_colorkey((0,0,0))
-        
-        #   Create Hp bar
         hpBar = Rect(1,1, hp, 16)
         hpOutline = Rect(0,0, maxHp+2, 16+2)
-        heartOutline = Rect(maxHp+3, 0, 18,18)
-
-        #   Blit hp bar to the surface
         rect(surf, (255,255,255), hpOutline, 1)
         rect(surf, (0,255,0), hpBar)
-        
 
-        #   Blit the heart image
-        heart = SpriteManager.getInstance().getSprite("heart.png", (0,1))
-        surf.blit(heart, (maxHp+4, 1))
-        rect(surf, (0,0,0), heartOutline, 1)
+        self.rebuilds += 1
+        return transform.scale2x(surf)
 
-        #   Blit kill count to the surface
-        count = str(killed)
-        text, length = WordManager.buildText("Slain: "+count, 3)
-        surf.blit(text, (0,18))
+    def buildHeart(self):
+        """
+        Heart icon with its outline.
+        """
+        surf = Hud.makeWidget(18, 18)
 
+        heart = SpriteManager.getInstance().getSprite("heart.png", (0,1))
+        surf.blit(heart, (1, 1))
+        rect(surf, (0,0,0), Rect(0,0, 18,18), 1)
 
+        self.rebuilds += 1
+        return transform.scale2x(surf)
 
+    def buildCounter(self, killed):
+        """
+        "Slain: N" text.
+        """
+        text, length = WordManager.buildText("Slain: "+str(killed), 3)
+        surf = Hud.makeWidget(*text.get_size())
+        surf.blit(text, (0,0))
 
+        self.rebuilds += 1
         return transform.scale2x(surf)
+
+    def makeWidget(width, height):
+        """
+        Return a transparent surface with one pixel of padding
+        so scale2x treats the edges like empty screen.
+        """
+        surf = Surface((width + 1, height + 1))
+        surf.set_colorkey((0,0,0))
+        return surf
+
+    def compose(self):
+        """
+        Blit the widgets into
+        a tight-bounds surface.
+        """
+        heartX = (self.maxHp + 3) * 2
+        width = max(heartX + self.heart.get_width(), self.hpBar.get_width(), self.counter.get_width())
+        height = max(self.hpBar.get_height(), 18 * 2 + self.counter.get_height())
+
+        self.surf = Surface((width, height))
+        self.surf.set_colorkey((0,0,0))
+        self.surf.blits(((self.hpBar, (0,0)),
+                         (self.heart, (heartX, 0)),
+                         (self.counter, (0, 18 * 2))), False)
+        self.dirty = False
+
+    def getSurface(self):
+        return self.surf
+
+    def draw(self, drawSurf, position):
+        drawSurf.blit(self.surf, position)
+
+
+class HudBuilder:
+
+    def getHud(hp, maxHp, killed):
+        """
+        Build a one-off HUD surface.
+        Use Hud to keep it between frames.
+        """
+        hud = Hud()
+        hud.update(hp, maxHp, killed)
+        return hud.getSurface()
@@ -0,0 +1,165 @@
+import pygame
+import time
+from pygame import Rect, Surface, transform
+
+"""
+Presenting the draw surface on the screen.
+
+The game draws at RESOLUTION. Getting that onto a bigger window
+can be done a few ways, and which is cheapest depends on the machine:
+
+direct  -> the window is RESOLUTION with the SCALED flag.
+           One blit, and SDL's renderer does the upscale.
+nearest -> the window is RESOLUTION * scale. Nearest-neighbour
+           scale straight into the screen, no new surfaces.
+scale2x -> the window is RESOLUTION * 2 and smoothed with scale2x.
+           Other scales scale2x into a kept buffer, then nearest.
+
+Usage: py -m UI.presenter [--frames 300] [--scales 1 2 3]
+"""
+
+class Presenter(object):
+    """
+    Puts the finished draw surface on the screen
+    in one of the MODES.
+    """
+
+    MODES = ("direct", "nearest", "scale2x")
+
+    def getWindow(mode, resolution, scale):
+        """
+        Return the window size and display flags a mode needs.
+        """
+        if mode not in Presenter.MODES:
+            raise ValueError(f"Unknown present mode {mode}, expected one of {Presenter.MODES}")
+
+        resolution = list(map(int, resolution))
+        if mode == "direct":
+            return resolution, pygame.SCALED
+        return [resolution[0] * scale, resolution[1] * scale], 0
+
+    def openWindow(mode, resolution, scale, flags = 0):
+        """
+        Set the display up for a mode and return the screen.
+        """
+        size, modeFlags = Presenter.getWindow(mode, resolution, scale)
+        return pygame.display.set_mode(size, flags = flags | modeFlags)
+
+    def __init__(self, drawSurface, screen, mode = "direct"):
+        if mode not in Presenter.MODES:
+            raise ValueError(f"Unknown present mode {mode}, expected one of {Presenter.MODES}")
+
+        self.drawSurface = drawSurface
+        self.screen = screen
+        self.mode = mode
+
+        size = drawSurface.get_size()
+        doubled = (size[0] * 2, size[1] * 2)
+
+        #   scale2x needs somewhere to go if the screen isn't exactly 2x
+        self.buffer = None
+        if mode == "scale2x" and screen.get_size() != doubled:
+            self.buffer = Surface(doubled, 0, drawSurface)
+
+    def present(self):
+        """
+        Copy the draw surface onto the screen.
+        Doesn't flip the display.
+        """
+        if self.mode == "direct" or self.screen.get_size() == self.drawSurface.get_size():
+            self.screen.blit(self.drawSurface, (0,0))
+
+        elif self.mode == "nearest":
+            transform.scale(self.drawSurface, self.screen.get_size(), self.screen)
+
+        elif self.buffer:
+            transform.scale2x(self.drawSurface, self.buffer)
+            transform.scale(self.buffer, self.screen.get_size(), self.screen)
+
+        else:
+            transform.scale2x(self.drawSurface, self.screen)
+
+    def presentRects(self, rects):
+        """
+        Copy some rects of the draw surface onto the screen,
+        matching what present() would put there.
+        Returns the rects of the screen that changed.
+        """
+        if self.buffer and rects:
+            ##  Nearest from the 2x buffer doesn't line up per rect
+            self.present()
+            return [self.screen.get_rect()]
+        return [self.presentRect(rect) for rect in rects]
+
+    def presentRect(self, rect):
+        """
+        Copy one rect of the draw surface onto the screen.
+        Returns the rect of the screen that changed.
+        """
+        if self.mode == "direct" or self.screen.get_size() == self.drawSurface.get_size():
+            self.screen.blit(self.drawSurface, rect, rect)
+            return rect
+
+        ##  scale2x output of a pixel depends on its neighbours,
+        ##  so the pixels around a changed rect change too
+        if self.mode == "scale2x":
+            rect = rect.inflate(2, 2).clip(self.drawSurface.get_rect())
+
+        scale = (self.screen.get_width() // self.drawSurface.get_width(),
+                 self.screen.get_height() // self.drawSurface.get_height())
+        scaled = Rect(rect.x * scale[0], rect.y * scale[1], rect.w * scale[0], rect.h * scale[1])
+
+        if self.mode == "nearest":
+            transform.scale(self.drawSurface.subsurface(rect), scaled.size, self.screen.subsurface(scaled))
+
+        else:
+            ##  Scale a pixel of margin for the neighbours and keep the middle
+            padded = rect.inflate(2, 2).clip(self.drawSurface.get_rect())
+            doubled = transform.scale2x(self.drawSurface.subsurface(padded))
+            self.screen.blit(doubled, scaled, ((rect.x - padded.x) * 2, (rect.y - padded.y) * 2, scaled.w, scaled.h))
+
+        return scaled
+
+    def measure(self, frames = 300, flip = True):
+        """
+        Return the average cost of one present, in milliseconds.
+        flip -> include pushing the frame to the display
+        """
+        start = time.perf_counter()
+        for i in range(frames):
+            self.present()
+            if flip:
+                pygame.display.flip()
+        return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    import argparse
+    from utils import RESOLUTION
+
+    parser = argparse.ArgumentParser(description = "Measure the cost of each present mode.")
+    parser.add_argument("--frames", type = int, default = 300)
+    parser.add_argument("--scales", type = int, nargs = "+", default = [1, 2, 3])
+    args = parser.parse_args()
+
+    pygame.init()
+    drawSurface = Surface(list(map(int, RESOLUTION)))
+    drawSurface.fill((40, 80, 120))
+
+    print(f"{'mode':<10} {'window':>12} {'ms/frame':>10}")
+    for mode in Presenter.MODES:
+        ##  SDL picks the window size for direct, so it's only run once
+        for scale in (args.scales if mode != "direct" else args.scales[:1]):
+            screen = Presenter.openWindow(mode, RESOLUTION, scale)
+            presenter = Presenter(drawSurface.convert(), screen, mode)
+            presenter.measure(10)  # Warm up
+            cost = presenter.measure(args.frames)
+
+            width, height = screen.get_size()
+            print(f"{mode:<10} {f'{width}x{height}':>12} {cost:10.3f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Batched blitting.
+
+A RenderQueue stands in for the draw surface while a layer of
+sprites is drawn. Each blit is only collected, with its destination
+already turned into integers, and blits that land entirely off the
+surface are dropped. flush() then draws the whole layer with a single
+Surface.fblits (or Surface.blits) call, so the per-sprite cost is
+appending a pair instead of a Python-level blit.
+"""
+
+class RenderQueue(object):
+    """
+    Collects blits and draws them in one call.
+    Blits are drawn in the order they were queued.
+    """
+
+    def __init__(self):
+        self.target = None
+        self.width = 0
+        self.height = 0
+        self.items = []     # (source, dest) or (source, dest, area, flags)
+        self.simple = True  # No item has an area or flags, so fblits can draw them
+
+        #   Stats for the last flush
+        self.queued = 0
+        self.culled = 0
+
+    def begin(self, target):
+        """
+        Start a layer drawn onto target.
+        Returns the queue to draw into.
+        """
+        self.target = target
+        self.width, self.height = target.get_size()
+        self.items.clear()
+        self.simple = True
+        self.queued = 0
+        self.culled = 0
+        return self
+
+    def blit(self, source, dest, area = None, special_flags = 0):
+        """
+        Queue a blit, like Surface.blit.
+        Returns None rather than the covered rect.
+        """
+        x = int(dest[0])
+        y = int(dest[1])
+        self.queued += 1
+
+        ##  Cull anything entirely off the surface
+        if area == None:
+            width, height = source.get_size()
+        else:
+            width, height = area[2], area[3]
+        if x >= self.width or y >= self.height or x + width <= 0 or y + height <= 0:
+            self.culled += 1
+            return
+
+        if area == None and not special_flags:
+            self.items.append((source, (x, y)))
+        else:
+            self.items.append((source, (x, y), area, special_flags))
+            self.simple = False
+
+    def blits(self, sequence, doreturn = True):
+        for blit in sequence:
+            self.blit(*blit)
+        if doreturn:
+            return []
+
+    def flush(self):
+        """
+        Draw every queued blit onto the target and empty the queue.
+        """
+        if self.items:
+            fblits = getattr(self.target, "fblits", None)
+            if self.simple and fblits != None:
+                fblits(self.items)
+            else:
+                self.target.blits(self.items, doreturn = False)
+            self.items.clear()
+        self.simple = True
+
+    def get_size(self):
+        return self.width, self.height
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+    def get_rect(self, **kwargs):
+        return self.target.get_rect(**kwargs)
+
+    def getStats(self):
+        return {"queued": self.queued, "culled": self.culled, "drawn": self.queued - self.culled}
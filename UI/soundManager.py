@@ -20,6 +20,14 @@ class SoundManager(object):
             cls._INSTANCE = cls._SM()
         
         return cls._INSTANCE
+
+    @classmethod
+    def setSilent(cls, silent = True):
+        """
+        Swap in a manager that plays nothing.
+        Used when running without audio.
+        """
+        cls._INSTANCE = cls._Silent() if silent else cls._SM()
     
     # Do not directly instantiate this class!
     class _SM(object):
@@ -98,3 +106,30 @@ class SoundManager(object):
             for song, player in self.dict.items():
                 if song.endswith(".wav"):
                     player.stop()
+
+    class _Silent(_SM):
+        """A SoundManager that loads and plays nothing."""
+
+        def playBGM(self, name):
+            pass
+
+        def fadeoutBGM(self, fadeoutAmount=1000):
+            pass
+
+        def playSFX(self, name, loops=0):
+            return None
+
+        def playVoice(self, name, loops=0):
+            return None
+
+        def playLowSFX(self, name, volume = 0.5, loops=0):
+            return None
+
+        def stopSFX(self, name):
+            pass
+
+        def playOnce(self, name):
+            pass
+
+        def stopAllSFX(self):
+            pass
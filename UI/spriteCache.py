@@ -0,0 +1,148 @@
+"""
+An on-disk cache of converted sprite sheets.
+
+Decoding a PNG is the slow part of loading an image. The first time
+a sheet is loaded, its converted pixels and frame table are written
+to images/cache/ as raw bytes; later launches read them back and wrap
+them in a Surface with image.frombuffer, skipping the PNG decoder.
+
+A cache file is keyed by its source's modification time and SHA-1:
+a changed time with the same hash still counts as fresh, and a
+different hash means the art changed and the cache is rebuilt.
+A sheet's frame size is stored too, so its table is rebuilt if the
+frame size changes in code.
+"""
+
+import hashlib
+import os
+import struct
+from os.path import join, getmtime
+from pygame import image
+
+
+class SpriteCache(object):
+    """Reads and writes cached sheets."""
+
+    #   Folder of cache files, inside the image folder
+    CACHE_FOLDER = "cache"
+
+    #   Binary layout (little-endian)
+    _MAGIC = b"WAKS"
+    _VERSION = 2
+    _HEADER = struct.Struct("<4sId20sIIIIII?4B")  # magic, version, mtime, sha1, width, height, alpha,
+                                                   # frame width, frame height, nRows, has color key, color key
+    _MTIME = struct.Struct("<d")                # the header's mtime, at _MTIME_OFFSET
+    _MTIME_OFFSET = 8
+    _ROW = struct.Struct("<I")                  # cells in the row
+    _CELL = struct.Struct("<IIII")              # x, y, width, height
+
+    #   Byte order of cached pixels, which matches converted Surfaces
+    _FORMAT = "BGRA"
+
+    def getPath(source):
+        folder, fileName = os.path.split(source)
+        return join(folder, SpriteCache.CACHE_FOLDER, fileName + ".bin")
+
+    def hash(source):
+        with open(source, "rb") as file:
+            return hashlib.sha1(file.read()).digest()
+
+    def read(source):
+        """
+        Return (pixels, size, alpha, colorKey, spriteSize, table) for a source image,
+        or None if there's no fresh cache of it. spriteSize is the frame
+        size the table was made with, or None if it isn't a sheet.
+        Safe to call from worker threads.
+        """
+        path = SpriteCache.getPath(source)
+        try:
+            with open(path, "rb") as file:
+                ##  Writable, since Surfaces made from it share it
+                data = bytearray(os.fstat(file.fileno()).st_size)
+                file.readinto(data)
+        except OSError:
+            return None
+
+        if len(data) < SpriteCache._HEADER.size:
+            return None
+        magic, version, mtime, digest, width, height, alpha, frameWidth, frameHeight, nRows, hasKey, *colorKey = \
+            SpriteCache._HEADER.unpack_from(data, 0)
+        if magic != SpriteCache._MAGIC or version != SpriteCache._VERSION:
+            return None
+
+        #   Only hash the source if its time changed,
+        #   and remember the new time if the art didn't
+        sourceTime = getmtime(source)
+        if mtime != sourceTime:
+            if digest != SpriteCache.hash(source):
+                return None
+            SpriteCache.touch(path, sourceTime)
+
+        position = SpriteCache._HEADER.size
+        table = []
+        for i in range(nRows):
+            count, = SpriteCache._ROW.unpack_from(data, position)
+            position += SpriteCache._ROW.size
+            table.append([SpriteCache._CELL.unpack_from(data, position + j * SpriteCache._CELL.size)
+                          for j in range(count)])
+            position += count * SpriteCache._CELL.size
+
+        pixels = memoryview(data)[position:]
+        if len(pixels) != width * height * 4:
+            return None
+        spriteSize = (frameWidth, frameHeight) if frameWidth else None
+        return pixels, (width, height), bool(alpha), tuple(colorKey) if hasKey else None, spriteSize, table
+
+    def touch(path, mtime):
+        """
+        Update a cache file's source time in place.
+        Best effort, like write().
+        """
+        try:
+            with open(path, "r+b") as file:
+                file.seek(SpriteCache._MTIME_OFFSET)
+                file.write(SpriteCache._MTIME.pack(mtime))
+        except OSError:
+            pass
+
+    def write(source, surf, alpha, table = None, spriteSize = None):
+        """
+        Cache a converted image and its frame table,
+        with the frame size the table was made with.
+        Caching is best effort; failing to write is ignored.
+        """
+        path = SpriteCache.getPath(source)
+        width, height = surf.get_size()
+        table = table or []
+        frameWidth, frameHeight = spriteSize or (0, 0)
+        colorKey = surf.get_colorkey()
+
+        parts = [SpriteCache._HEADER.pack(SpriteCache._MAGIC, SpriteCache._VERSION, getmtime(source),
+                                          SpriteCache.hash(source), width, height, int(alpha),
+                                          frameWidth, frameHeight, len(table),
+                                          colorKey != None, *(colorKey or (0,0,0,0)))]
+        for row in table:
+            parts.append(SpriteCache._ROW.pack(len(row)))
+            parts.extend(SpriteCache._CELL.pack(*cell) for cell in row)
+        parts.append(image.tobytes(surf, SpriteCache._FORMAT))
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+            temporary = path + ".tmp"
+            with open(temporary, "wb") as file:
+                file.write(b"".join(parts))
+            os.replace(temporary, path)
+        except OSError:
+            pass
+
+    def toSurface(pixels, size, alpha, colorKey = None):
+        """
+        Wrap cached pixels in a Surface.
+        Pixels with alpha are used in place; opaque ones are converted.
+        """
+        surf = image.frombuffer(pixels, size, SpriteCache._FORMAT)
+        if not alpha:
+            surf = surf.convert()
+        if colorKey:
+            surf.set_colorkey(colorKey)
+        return surf
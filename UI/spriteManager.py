@@ -9,7 +9,10 @@ Will load entire sprite sheets if given an offset.
 
 from pygame import image, Surface, Rect, SRCALPHA, transform
 from os.path import join
-from utils import vec
+from concurrent.futures import ThreadPoolExecutor
+import time
+from utils import vec, LRUCache, RESOLUTION
+from .spriteCache import SpriteCache
 
 class SpriteManager(object):
    """A singleton factory class to create and store sprites on demand."""
@@ -81,18 +84,89 @@ class SpriteManager(object):
       
       # A list of images that require to be loaded with a color key
       _COLOR_KEY = ["chars.png"]
+
+      # Sheets are sliced into subsurface views of the converted sheet.
+      # These are sliced into copies instead, since each frame
+      # gets its own color key or is drawn on.
+      _COPY_SHEETS = list(_COLOR_KEY)
+
+      # Slice every sheet into copies
+      _COPY_ALL = False
+
+      # Images to preload at startup, and whether each is a sheet
+      _MANIFEST = {
+         "trey_logo.png":False, "title.png":False, "bg_1.png":False, "pause.png":False,
+         "chars.png":True, "heart.png":True, "bullet.png":True,
+         "player_1.png":True, "player_2.png":True,
+      }
+      _MANIFEST.update({f"ground_{i}.png":True for i in range(1, 6)})
+      _MANIFEST.update({f"flyer_{i}.png":True for i in range(1, 7)})
+
+      # Threads decoding PNGs for preload
+      _WORKERS = 4
+
+      # Most bytes of loaded images to keep before evicting
+      # the least recently used ones
+      _BUDGET = 64 * 1024 * 1024
+
+      # Images that are always needed and never evicted
+      _PINNED = ["chars.png", "player_1.png", "player_2.png", "heart.png"]
+
+      # Scaled variants the game uses: (file name, scale, filter)
+      _SCALED = [("title.png", tuple(map(int, RESOLUTION)), "nearest"),
+                 ("bg_1.png", 2, "scale2x")]
+
+      # Ways to scale an image
+      _FILTERS = ("nearest", "scale2x", "smooth")
       
       def __init__(self):
          # Stores the surfaces indexed based on file name
          # The values in _surfaces can be a single Surface
          #  or a two dimentional grid of surfaces if it is an image sheet
-         self._surfaces = {}      
+         self._surfaces = LRUCache(SpriteManager._SM._BUDGET, SpriteManager._SM.getBytes)
+         for fileName in SpriteManager._SM._PINNED:
+            self._surfaces.pin(fileName)
+
+         # How each sheet was sliced, for the memory report
+         self._sheetInfo = {}
+
+         # Preloads still decoding: file name -> (future, sheet)
+         self._pending = {}
+         self._loadStart = None
+         self.loadTime = None
       
       def __getitem__(self, key):
          return self._surfaces[key]
    
       def __setitem__(self, key, item):
-         self._surfaces[key] = item
+         self._surfaces.put(key, item)
+
+      def getBytes(item):
+         """
+         Return the bytes an image or sheet holds.
+         Frames that are views of a sheet count the sheet once.
+         """
+         if not isinstance(item, list):
+            return item.get_width() * item.get_height() * item.get_bytesize()
+
+         surfaces = {}
+         for row in item:
+            for sprite in row:
+               owner = sprite.get_parent() or sprite
+               surfaces[id(owner)] = owner
+         return sum(map(SpriteManager._SM.getBytes, surfaces.values()))
+
+      def pin(self, fileName):
+         """
+         Never evict an image, like the _PINNED ones.
+         For images something else keeps references to,
+         which evicting wouldn't free.
+         """
+         self._surfaces.pin(fileName)
+
+      def getStats(self):
+         """Return the cache's counters, with its size in bytes as used."""
+         return self._surfaces.getStats()
       
       def getSize(self, fileName):
          spriteSize = SpriteManager._SM._SPRITE_SIZES.get(fileName,
@@ -100,29 +174,83 @@ class SpriteManager(object):
          return spriteSize
       
       def getSprite(self, fileName, offset=None, enemy = False, scale = False):
+         # Scaled sprites are cached under their own key
+         if scale:
+            return self.getScaled(fileName, 2, "scale2x", offset)
+
+         # If this sprite is being preloaded, wait for it
+         if fileName in self._pending:
+            self._finishImage(fileName)
+
          # If this sprite has not already been loaded, load the image from memory
-         
-         if fileName not in self._surfaces.keys():
-            
-            self._loadImage(fileName, offset != None, scale=scale)
+         sprites = self._surfaces.get(fileName)
+         if sprites == None:
+            self._loadImage(fileName, offset != None)
+            sprites = self[fileName]
          
          # If this is an image sheet, return the correctly offset sub surface
          if offset != None:
-            return self[fileName][offset[1]][offset[0]]
+            return sprites[offset[1]][offset[0]]
          
          # Otherwise, return the sheet created
-         return self[fileName]
+         return sprites
       
+      def getScaled(self, fileName, scale = 2, filter = "scale2x", offset = None):
+         """
+         Return an image, or one frame of a sheet, scaled by a factor
+         or to a (width, height). Each variant is made once and cached
+         under (asset, scale, filter).
+         filter -> "nearest", "scale2x", or "smooth"
+         """
+         asset = fileName if offset == None else (fileName, tuple(offset))
+         key = (asset, scale, filter)
+         scaled = self._surfaces.get(key)
+         if scaled == None:
+            scaled = SpriteManager._SM.scaleSurface(self.getSprite(fileName, offset), scale, filter)
+            self[key] = scaled
+         return scaled
+
+      def prewarm(self, variants = None):
+         """
+         Make the scaled variants in _SCALED, or the given
+         (file name, scale, filter) list, ahead of time.
+         """
+         for fileName, scale, filter in variants or SpriteManager._SM._SCALED:
+            self.getScaled(fileName, scale, filter)
+
+      def scaleSurface(surf, scale, filter):
+         """
+         Return a new surface scaled by a factor or to a size.
+         scale2x doubles as many times as it fits,
+         then makes up the rest with nearest.
+         """
+         if filter not in SpriteManager._SM._FILTERS:
+            raise ValueError(f"Unknown filter {filter}, expected one of {SpriteManager._SM._FILTERS}")
+
+         width, height = surf.get_size()
+         if isinstance(scale, (int, float)):
+            size = (round(width * scale), round(height * scale))
+         else:
+            size = tuple(map(int, scale))
+
+         if filter == "smooth":
+            return transform.smoothscale(surf, size)
+
+         if filter == "scale2x":
+            while surf.get_width() * 2 <= size[0] and surf.get_height() * 2 <= size[1]:
+               surf = transform.scale2x(surf)
+            if surf.get_size() == size:
+               return surf
+
+         return transform.scale(surf, size)
+
       def getLevel(self, fileName):
-         if fileName not in self._surfaces.keys():
+         if self._surfaces.get(fileName) == None:
             self._loadImage(fileName, level = True)
          return self[fileName]
       
       def getFx(self, room_dir, fileName, offset = None):
-         if fileName not in self._surfaces.keys():
-            self._loadFx(room_dir, fileName, offset != None)
-         else:
-            delattr
+         if self._surfaces.get(fileName) == None:
             self._loadFx(room_dir, fileName, offset != None)
          
          if offset != None:
@@ -130,78 +258,209 @@ class SpriteManager(object):
          return self[fileName]
       
       def getEnemy(self, fileName, direction):
-         if fileName not in self._surfaces.keys():
+         if self._surfaces.get(fileName) == None:
             self._loadImage(fileName, sheet = True, enemy = True)
          return self[fileName][direction][0]
       
-      def _loadImage(self, fileName, sheet=False, level = False, enemy = False, scale = False):
+      def preload(self, manifest = None):
+         """
+         Start decoding every image in the manifest on worker threads.
+         image.load releases the GIL, so this runs behind the game;
+         finishPreload converts and slices them on the main thread.
+         """
+         manifest = manifest or SpriteManager._SM._MANIFEST
+         self._loadStart = time.perf_counter()
+         self.loadTime = None
+
+         pool = ThreadPoolExecutor(SpriteManager._SM._WORKERS)
+         for fileName, sheet in manifest.items():
+            if fileName not in self._surfaces and fileName not in self._pending:
+               future = pool.submit(SpriteManager._SM._readFile, join(SpriteManager._SM._IMAGE_FOLDER, fileName))
+               self._pending[fileName] = (future, sheet)
+
+         # Submitted loads still finish; this just doesn't wait for them
+         pool.shutdown(wait = False)
+
+      def finishPreload(self, block = False):
+         """
+         Convert and slice the preloaded images that are decoded.
+         block -> wait for all of them
+         Returns True once nothing is left to load.
+         """
+         for fileName in list(self._pending):
+            future = self._pending[fileName][0]
+            if block or future.done():
+               self._finishImage(fileName)
+
+         if self._pending or self._loadStart == None:
+            return not self._pending
+
+         self.loadTime = time.perf_counter() - self._loadStart
+         self._loadStart = None
+         return True
+
+      def isLoading(self):
+         return bool(self._pending)
+
+      def _finishImage(self, fileName):
+         future, sheet = self._pending.pop(fileName)
+         self._finishFile(future.result(), join(SpriteManager._SM._IMAGE_FOLDER, fileName), fileName, sheet)
+
+      def _readFile(path):
+         """
+         Read an image's cache if it's fresh, otherwise decode the image.
+         Safe to call from worker threads.
+         """
+         cached = SpriteCache.read(path)
+         return cached if cached else image.load(path)
+
+      def _finishFile(self, loaded, path, fileName, sheet = False):
+         """
+         Slice an image read by _readFile,
+         and cache it if it was decoded.
+         """
+         transparent = fileName in SpriteManager._SM._TRANSPARENCY
+         spriteSize = tuple(self.getSize(fileName)) if sheet else None
+         if isinstance(loaded, tuple):
+            pixels, size, alpha, colorKey, cachedSize, table = loaded
+            if alpha == transparent and cachedSize == spriteSize:
+               self._loadRoutine(SpriteCache.toSurface(pixels, size, alpha, colorKey), fileName, sheet,
+                                 converted = True, table = table)
+               return
+            ##  Cached with the wrong transparency or frame size
+            loaded = image.load(path)
+
+         fullImage, table = self._loadRoutine(loaded, fileName, sheet)
+         SpriteCache.write(path, fullImage, transparent, table, spriteSize)
+
+      def _loadImage(self, fileName, sheet=False, level = False, enemy = False):
          # Load the full image
          if level:
-            fullImage = image.load(join(SpriteManager._SM._ROOM_FOLDER, fileName))
+            path = join(SpriteManager._SM._ROOM_FOLDER, fileName)
          elif enemy:
-            fullImage = image.load(join(SpriteManager._SM._ENEMY_FOLDER, fileName))
+            path = join(SpriteManager._SM._ENEMY_FOLDER, fileName)
          else:
-            fullImage = image.load(join(SpriteManager._SM._IMAGE_FOLDER, fileName))
-         
-         if scale:
-            fullImage = transform.scale2x(fullImage)
+            path = join(SpriteManager._SM._IMAGE_FOLDER, fileName)
          
-         self._loadRoutine(fullImage, fileName, sheet)
+         self._finishFile(SpriteManager._SM._readFile(path), path, fileName, sheet)
          
       def _loadFx(self, room_dir, fileName, sheet = False):
           effects_folder = SpriteManager._SM._ROOM_FOLDER + "\\"+room_dir
           fullImage = image.load(join(effects_folder, fileName))
           self._loadRoutine(fullImage, fileName, sheet, True)
 
-      def _loadRoutine(self, fullImage, fileName, sheet = False, transparent = False):
+      def getTable(sheetDimensions, spriteSize):
+         """
+         Return the (x, y, width, height) of every frame
+         in a sheet, row by row.
+         """
+         return [[(x, y, spriteSize[0], spriteSize[1]) for x in range(0, sheetDimensions[0], spriteSize[0])]
+                 for y in range(0, sheetDimensions[1], spriteSize[1])]
+
+      def _loadRoutine(self, fullImage, fileName, sheet = False, transparent = False, converted = False, table = None):
+         """
+         Convert an image, unless it already is, and store it
+         or slice it into a sheet.
+         Returns the converted image and its frame table.
+         """
          if not transparent:
             # Look up some information about the image to be loaded
             transparent = fileName in SpriteManager._SM._TRANSPARENCY
          colorKey = fileName in SpriteManager._SM._COLOR_KEY
          
          # Detect if a transparency is needed
-         if transparent:
-            fullImage = fullImage.convert_alpha()
-         else:
-            fullImage = fullImage.convert()
+         if not converted:
+            if transparent:
+               fullImage = fullImage.convert_alpha()
+            else:
+               fullImage = fullImage.convert()
          
          # If the image to be loaded is an image sheet, split it up based on the sprite size
          if sheet:
             
             #  Array of sprites
-            self[fileName] = []
+            sprites = []
             
             # Try to get the sprite size, use the default size if it is not stored
             spriteSize = self.getSize(fileName)
 
             # See how big the sprite sheet is
             sheetDimensions = fullImage.get_size()
+            bounds = fullImage.get_rect()
+
+            copy = SpriteManager._SM._COPY_ALL or fileName in SpriteManager._SM._COPY_SHEETS
+
+            # Where each frame is, unless the cache had it
+            table = table or SpriteManager._SM.getTable(sheetDimensions, spriteSize)
             
-            # Iterate over the entire sheet, increment by the sprite size
-            for y in range(0, sheetDimensions[1], spriteSize[1]):
-               self[fileName].append([])
-               for x in range(0, sheetDimensions[0], spriteSize[0]):
+            # Iterate over the entire sheet, one frame at a time
+            for row in table:
+               sprites.append([])
+               for cell in row:
+                  cell = Rect(cell)
+
+                  # A view into the sheet, unless it hangs off the edge
+                  if not copy and bounds.contains(cell):
+                     sprites[-1].append(fullImage.subsurface(cell))
+                     continue
                   
                   # If we need transparency
                   if transparent:
-                     sprite = Surface(spriteSize, SRCALPHA, 32)
+                     sprite = Surface(cell.size, SRCALPHA, 32)
                   else:
-                     sprite = Surface(spriteSize)
+                     sprite = Surface(cell.size)
                   
-                  sprite.blit(fullImage, (0,0), Rect((x,y), spriteSize))
+                  sprite.blit(fullImage, (0,0), cell)
                   
                   # If we need to set the color key
                   if colorKey:
                      sprite.set_colorkey(sprite.get_at((0,0)))
                   
                   # Add the sprite to the end of the current row
-                  self[fileName][-1].append(sprite)
+                  sprites[-1].append(sprite)
+
+            # Stored once it's whole, so its size is known
+            self[fileName] = sprites
+            frames = sum(map(len, sprites))
+            self._sheetInfo[fileName] = (sheetDimensions, spriteSize, frames, fullImage.get_bytesize(), copy)
          else:
-            # Not a sprite sheet, full image is what we wish to store
-            self[fileName] = fullImage
-               
             # If we need to set the color key
             if colorKey:
-               self[fileName].set_colorkey(self[fileName].get_at((0,0)))
-            
-         
\ No newline at end of file
+               fullImage.set_colorkey(fullImage.get_at((0,0)))
+
+            # Not a sprite sheet, full image is what we wish to store
+            self[fileName] = fullImage
+
+            table = None
+
+         return fullImage, table
+
+      def getMemoryReport(self):
+         """
+         For each loaded sheet, the bytes it takes
+         sliced into views and sliced into copies.
+         """
+         report = {}
+         for fileName, (size, spriteSize, frames, bytesize, copy) in self._sheetInfo.items():
+            report[fileName] = {"frames": frames,
+                                "mode": "copy" if copy else "subsurface",
+                                "subsurfaceBytes": size[0] * size[1] * bytesize,
+                                "copyBytes": frames * spriteSize[0] * spriteSize[1] * bytesize,
+                                # Copying holds the sheet and its copies at once
+                                "copyPeakBytes": (size[0] * size[1] + frames * spriteSize[0] * spriteSize[1]) * bytesize}
+         return report
+
+
+if __name__ == "__main__":
+   import pygame
+   pygame.init()
+   pygame.display.set_mode((1,1))
+
+   manager = SpriteManager.getInstance()
+   manager.preload()
+   manager.finishPreload(block = True)
+
+   print(f"{'sheet':<16} {'frames':>6} {'mode':>10} {'views KiB':>10} {'copies KiB':>11} {'copy peak KiB':>14}")
+   for fileName, sheet in manager.getMemoryReport().items():
+      print(f"{fileName:<16} {sheet['frames']:6} {sheet['mode']:>10} {sheet['subsurfaceBytes'] / 1024:10.1f} "
+            f"{sheet['copyBytes'] / 1024:11.1f} {sheet['copyPeakBytes'] / 1024:14.1f}")
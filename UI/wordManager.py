@@ -1,8 +1,8 @@
 from pygame import Surface, transform
-from os.path import join
-from random import randint
 from UI import SpriteManager
-from utils import RESOLUTION, vec
+from .glyphAtlas import GlyphAtlas, TextCycle
+from utils import LRUCache
+from .wordStore import WordStore
 
 """
 Manages words for the game.
@@ -12,57 +12,130 @@ class WordManager:
 
     DIFFICULTY = None
 
+    #   The compiled word store, mapped on first use
+    STORE = None
+
+    #   The word list regular enemies draw from
+    POOL = "common"
+
+    #   Rendered text surfaces, keyed by (text, row, scale mode)
+    TEXT_CACHE = LRUCache(256)
+
+    #   Colour-cycling text, keyed by (text, first row, scale mode)
+    CYCLE_CACHE = LRUCache(256)
+
+    #   Shared colour clock for cycling text
+    TEXT_PHASE = 0
+    TEXT_TIMER = 0.0
+    TEXT_PERIOD = 0.2
+
     def setDifficulty(diff = None):
         if WordManager.DIFFICULTY == None:
             WordManager.DIFFICULTY = diff
 
+    def setPool(pool = "common"):
+        """
+        Change the word list used by getCommon.
+        Any list in words/ can be used, including "all".
+        """
+        WordManager.POOL = pool
+
+    def getStore():
+        """
+        Return the word store,
+        compiling and mapping it the first time.
+        """
+        if WordManager.STORE == None:
+            WordManager.STORE = WordStore.load()
+        return WordManager.STORE
+
+    def getWord(pool = "common", length = None):
+        """
+        Return a random word from a word list,
+        optionally limited to one length.
+        """
+        store = WordManager.getStore()
+        index = store.randomIndex(pool, length)
+        word = store[index]
+
+        if WordManager.DIFFICULTY == "easy" and "'" in word:
+            start, count = store.getRange(pool, length)
+            for i in range(count):
+                word = store[start + (index - start + i) % count]
+                if "'" not in word:
+                    break
+
+        return word
+
     def getCommon(sniping = False):
         """
         Return a common word from
-        1000-most-common-words.txt
+        the active word pool.
         """
-        rand = randint(1,998)
-        words = open("words\\common.txt")
-        lines = words.readlines()
-        line = lines[rand]
+        word = WordManager.getWord(WordManager.POOL)
 
-        if WordManager.DIFFICULTY == "easy":
-            if "'" in line:
-                line = lines[rand+1]
-        
         if sniping:
-            return line[0].upper()
-        
+            return word[0].upper()
+
         else:
-            string = line[0].upper() + line[1:line.index("\n")]
-            return string
-    
+            return word[0].upper() + word[1:]
+
     def getSeven(hard = False):
         """
         Return a seven letter word.
-        If hard: get it from word-list-7-letters.txt
-        else:    get it from common-7-letter-words.txt
+        If hard: get it from hard7.txt
+        else:    get it from common7.txt
+        """
+        word = WordManager.getWord("hard7" if hard else "common7", 7)
+        return word[0].upper() + word[1:]
+
+    def getTextStats():
+        """
+        Return the text cache's
+        hit, miss, and eviction counters.
         """
-        rand = randint(1,40092)
-        words = open("words\\hard7.txt")
-        lines = words.readlines()
-        line = lines[rand]
-        string = line[0].upper() + line[1:line.index("\n")]
-        return string
+        return WordManager.TEXT_CACHE.getStats()
 
     def buildText(text, row, scale = False, getLen = True, title = False):
         """
         Create a surface containing
         some text.
+        Rendered surfaces are cached by (text, row, scale mode)
+        and shared between callers, so they must not be modified.
         """
+        if scale:
+            mode = "title" if title else "scale2x"
+        else:
+            mode = None
 
-        #   Initialize the surface and positional vars
-        surf = Surface(vec(*RESOLUTION))
-        surf.set_colorkey((0,0,0)) # Make black transparent
+        key = (text, row, mode)
+        cached = WordManager.TEXT_CACHE.get(key)
+        if cached == None:
+            surf, x = WordManager.renderText(text, row)
 
+            if mode == "title":
+                surf = transform.scale(surf, (surf.get_width() * 4, surf.get_height() * 4))
+            elif mode == "scale2x":
+                surf = transform.scale2x(surf)
+
+            cached = (surf, x)
+            WordManager.TEXT_CACHE.put(key, cached)
+
+        if getLen:
+            return cached
+        else:
+            return cached[0]
+
+    def layoutText(text):
+        """
+        Place each letter of some text.
+        Returns a list of (glyph index, x) pairs
+        and the text's length.
+        """
         x = 0   # x coordinate of the letter
         dx = 8  # difference in x for each char
 
+        glyphs = []
         for char in text:
             #  Adjust the spacing. About 2 Pixels between each char.
             if char == "I":
@@ -80,28 +153,92 @@ class WordManager:
             elif char == " ":
                 x += dx
                 continue
-            
-            #   Blit the letter to the surface, update the position
-            image = SpriteManager.getInstance().getSprite("chars.png", (ord(char)-33, row))
-            surf.blit(image, vec(x, 0))
+
+            #   Queue the letter, update the position
+            glyphs.append((ord(char)-33, x))
             x += dx
             dx = 8
-        
 
-        ##  Return the scaled surface
-        if scale:
-            if getLen:
-                if title:
-                    return transform.scale(surf, (surf.get_width() * 4, surf.get_height() * 4)), x
-                else:
-                    return transform.scale2x(surf), x
-            else:
-                return transform.scale2x(surf)
-        
-        ##  Return the unscaled surface
+        return glyphs, x
+
+    def renderText(text, row):
+        """
+        Rasterize some text onto a new surface
+        just big enough to hold it.
+        row -> the colour row, or a sequence of one row per character
+        Returns the surface and the text's length.
+        """
+        glyphs, x = WordManager.layoutText(text)
+        width = max([gx + 8 for glyph, gx in glyphs], default = 0)
+
+        #   The row of each glyph; spaces have no glyph
+        if isinstance(row, int):
+            rows = [row] * len(glyphs)
         else:
-            if getLen:
-                return surf,x
+            rows = [r for char, r in zip(text, row) if char != " "]
+
+        #   Initialize the surface and blit the letters.
+        #   One pixel of padding keeps scale2x's edges
+        #   the same as on a full-screen surface.
+        surf = Surface((width + 1, 17))
+        surf.set_colorkey((0,0,0)) # Make black transparent
+        surf.blits([(SpriteManager.getInstance().getSprite("chars.png", (glyph, r)), (gx, 0))
+                    for (glyph, gx), r in zip(glyphs, rows)], False)
+
+        return surf, x
+
+    def getCycleStats():
+        """
+        Return the colour-cycling text cache's
+        hit, miss, and eviction counters.
+        """
+        return WordManager.CYCLE_CACHE.getStats()
+
+    def updateClock(seconds):
+        """
+        Advance the shared text colour clock.
+        Every colour-cycling text reads its phase from here.
+        """
+        WordManager.TEXT_TIMER += seconds
+        if WordManager.TEXT_TIMER >= WordManager.TEXT_PERIOD:
+            WordManager.TEXT_TIMER = 0.0
+            WordManager.TEXT_PHASE += 1
+            WordManager.TEXT_PHASE %= GlyphAtlas.PHASES
+
+    def buildCycle(text, row, scale = False, highlight = 0, highlightRow = 4):
+        """
+        Create colour-cycling text.
+        row is the first of the 4 colour rows to cycle through
+        and must be a multiple of 4.
+        highlight -> number of leading characters to cycle
+                     through highlightRow's colours instead
+        Returns a TextCycle; draw cycle.getSurface(phase).
+        """
+        key = (text, row, "scale2x" if scale else None, highlight, highlightRow)
+        cycle = WordManager.CYCLE_CACHE.get(key)
+        if cycle == None and highlight:
+            ##  Laid out once as the whole text, with a row per character
+            surfs = []
+            for phase in range(GlyphAtlas.PHASES):
+                rows = [highlightRow + phase] * highlight + [row + phase] * (len(text) - highlight)
+                surf, x = WordManager.renderText(text, rows)
+                surfs.append(transform.scale2x(surf) if scale else surf)
+            cycle = TextCycle(surfs, x)
+            WordManager.CYCLE_CACHE.put(key, cycle)
+
+        elif cycle == None:
+            atlas = GlyphAtlas.getInstance(row // GlyphAtlas.PHASES)
+            glyphs, x = WordManager.layoutText(text)
+
+            if all(atlas.cyclable[glyph] for glyph, gx in glyphs):
+                cycle = TextCycle(atlas.renderPhases(glyphs, scale), x)
             else:
-                return surf
-    
+                ##  Some letters change shape between rows,
+                ##  so keep one full-colour surface per row
+                surfs = [WordManager.buildText(text, row + phase, scale, False)
+                         for phase in range(GlyphAtlas.PHASES)]
+                cycle = TextCycle(surfs, x)
+
+            WordManager.CYCLE_CACHE.put(key, cycle)
+
+        return cycle
@@ -0,0 +1,194 @@
+"""
+A compiled, memory-mapped word store.
+
+Every list in words/ is packed into a single binary file:
+a header, a bucket table, an offsets array, and one string blob.
+Words are grouped by source list (the difficulty) and sorted by length,
+so every (difficulty, length) bucket is a contiguous run of indices.
+Picking a random word is one offset lookup into the mapped file.
+Only words the player can type are kept: letters and apostrophes,
+no longer than MAX_LENGTH.
+
+Compile it offline with:  py -m UI.wordStore
+"""
+
+import mmap
+import re
+import struct
+from os import listdir
+from os.path import join, getmtime, exists, splitext
+from random import randint
+
+
+class WordStore(object):
+    """Read-only view of a compiled word store."""
+
+    #   Folder containing the word lists and the compiled store
+    WORD_FOLDER = "words"
+    STORE_FILE = "words.bin"
+
+    #   Words longer than this, or with anything but letters
+    #   and apostrophes, are left out of the store
+    MAX_LENGTH = 12
+    _TYPABLE = re.compile(r"[a-z']+")
+
+    #   Binary layout (little-endian)
+    _MAGIC = b"WAKW"
+    _VERSION = 2
+    _HEADER = struct.Struct("<4sIIII")      # magic, version, nWords, nBuckets, blobLength
+    _BUCKET = struct.Struct("<16sIII")      # difficulty, length, start, count
+    _OFFSET = struct.Struct("<I")
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.nWords, nBuckets, blobLength = WordStore._HEADER.unpack_from(self._map, 0)
+        if magic != WordStore._MAGIC or version != WordStore._VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {WordStore._VERSION} word store")
+
+        #   Maps (difficulty, length) -> (start, count)
+        #   and difficulty -> (start, count) for the whole list
+        self.buckets = {}
+        self.difficulties = {}
+
+        position = WordStore._HEADER.size
+        for i in range(nBuckets):
+            name, length, start, count = WordStore._BUCKET.unpack_from(self._map, position)
+            name = name.rstrip(b"\0").decode("ascii")
+            self.buckets[(name, length)] = (start, count)
+
+            first, total = self.difficulties.get(name, (start, 0))
+            self.difficulties[name] = (min(first, start), total + count)
+            position += WordStore._BUCKET.size
+
+        self._offsets = position
+        self._blob = self._offsets + (self.nWords + 1) * WordStore._OFFSET.size
+
+    def __len__(self):
+        return self.nWords
+
+    def __getitem__(self, index):
+        """Return the word at index. O(1)."""
+        start, end = struct.unpack_from("<II", self._map, self._offsets + index * WordStore._OFFSET.size)
+        return self._map[self._blob + start:self._blob + end].decode("ascii")
+
+    def getRange(self, difficulty, length = None):
+        """
+        Return the (start, count) index range
+        for a difficulty, optionally limited to one word length.
+        """
+        if length is None:
+            return self.difficulties.get(difficulty, (0, 0))
+        return self.buckets.get((difficulty, length), (0, 0))
+
+    def getLengths(self, difficulty):
+        """Return the sorted word lengths available in a difficulty."""
+        return sorted(length for name, length in self.buckets if name == difficulty)
+
+    def randomIndex(self, difficulty, length = None):
+        """Return a random index into the given bucket."""
+        start, count = self.getRange(difficulty, length)
+        if count == 0:
+            raise KeyError(f"No words for {difficulty!r} with length {length}")
+        return start + randint(0, count - 1)
+
+    def random(self, difficulty, length = None):
+        """Return a random word from the given bucket."""
+        return self[self.randomIndex(difficulty, length)]
+
+    def close(self):
+        self._map.close()
+
+    ##  ------------------------------------------- ##
+                ##  Compilation   ##
+
+    @classmethod
+    def getPath(cls, folder = None):
+        return join(folder or cls.WORD_FOLDER, cls.STORE_FILE)
+
+    @classmethod
+    def getSources(cls, folder = None):
+        """Return the word lists in the folder, keyed by difficulty."""
+        folder = folder or cls.WORD_FOLDER
+        return {splitext(f)[0]: join(folder, f) for f in sorted(listdir(folder)) if f.endswith(".txt")}
+
+    @classmethod
+    def isStale(cls, folder = None):
+        """
+        True if the store is missing, from another version,
+        or older than any word list.
+        """
+        path = cls.getPath(folder)
+        if not exists(path):
+            return True
+        with open(path, "rb") as file:
+            header = file.read(cls._HEADER.size)
+        if len(header) < cls._HEADER.size or cls._HEADER.unpack(header)[:2] != (cls._MAGIC, cls._VERSION):
+            return True
+        built = getmtime(path)
+        return any(getmtime(source) > built for source in cls.getSources(folder).values())
+
+    @classmethod
+    def isTypable(cls, word):
+        """True if the player can type the word."""
+        return 0 < len(word) <= cls.MAX_LENGTH and cls._TYPABLE.fullmatch(word.lower()) != None
+
+    @classmethod
+    def compile(cls, folder = None):
+        """
+        Pack every word list in the folder into the store.
+        Returns the path of the compiled file.
+        """
+        buckets = []
+        words = []
+
+        for difficulty, source in cls.getSources(folder).items():
+            with open(source, encoding="ascii") as file:
+                lines = [line.strip() for line in file]
+            lines = sorted((line for line in lines if cls.isTypable(line)), key=len)
+
+            ##  Split the sorted list into runs of equal length
+            start = 0
+            while start < len(lines):
+                length = len(lines[start])
+                end = start
+                while end < len(lines) and len(lines[end]) == length:
+                    end += 1
+                buckets.append((difficulty, length, len(words) + start, end - start))
+                start = end
+
+            words.extend(lines)
+
+        ##  Build the offsets array and the blob
+        blob = "".join(words).encode("ascii")
+        offsets = [0]
+        for word in words:
+            offsets.append(offsets[-1] + len(word))
+
+        path = cls.getPath(folder)
+        with open(path, "wb") as file:
+            file.write(cls._HEADER.pack(cls._MAGIC, cls._VERSION, len(words), len(buckets), len(blob)))
+            for difficulty, length, start, count in buckets:
+                file.write(cls._BUCKET.pack(difficulty.encode("ascii"), length, start, count))
+            file.write(struct.pack(f"<{len(offsets)}I", *offsets))
+            file.write(blob)
+
+        return path
+
+    @classmethod
+    def load(cls, folder = None):
+        """Open the store, compiling it first if it is stale."""
+        if cls.isStale(folder):
+            cls.compile(folder)
+        return cls(cls.getPath(folder))
+
+
+if __name__ == "__main__":
+    path = WordStore.compile()
+    store = WordStore(path)
+    for difficulty, (start, count) in store.difficulties.items():
+        print(f"{difficulty}: {count} words")
+    print(f"Wrote {len(store)} words to {path}")
@@ -0,0 +1,260 @@
+"""
+Microbenchmarks for the game's hot functions.
+
+Runs headless (see headless.py) and times each benchmark
+as the best of several repeats. Results are written as JSON, and
+--compare flags anything slower than a saved baseline.
+
+Usage:
+    py benchmark.py --output baseline.json
+    py benchmark.py --compare baseline.json [--threshold 0.1]
+"""
+
+import headless
+
+import argparse
+import json
+import platform
+import sys
+import time
+import pygame
+
+from objects import Walker, Bullet
+from UI import SpriteManager, WordManager, HudBuilder, Hud, Presenter
+from utils import RESOLUTION, vec
+
+
+##  ----------------------------------------------- ##
+                ##  Benchmarks   ##
+
+#   Each benchmark is a setup function returning the callable to time.
+BENCHMARKS = {}
+
+def benchmark(name, number = 1000):
+    """Register a benchmark's setup function."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, number)
+        return setup
+    return register
+
+
+SHORT = "Word"
+LONG = "The quick brown fox jumps over the lazy dog"
+
+def buildTextBench(text, scale, cold):
+    def setup():
+        def call():
+            if cold:
+                WordManager.TEXT_CACHE.clear()
+            WordManager.buildText(text, 0, scale)
+        return call
+    return setup
+
+for length, text in (("short", SHORT), ("long", LONG)):
+    for scaled in (False, True):
+        for cold in (False, True):
+            benchmark(f"buildText.{length}.{'scaled' if scaled else 'unscaled'}.{'cold' if cold else 'warm'}",
+                      200 if cold else 5000)(buildTextBench(text, scaled, cold))
+
+
+@benchmark("getCommon", 5000)
+def getCommon():
+    WordManager.getStore()
+    return WordManager.getCommon
+
+
+@benchmark("getSprite.cold", 20)
+def getSpriteCold():
+    manager = SpriteManager.getInstance()
+    def call():
+        manager._surfaces.pop("player_2.png", None)
+        manager.getSprite("player_2.png", (0,0))
+    return call
+
+@benchmark("getSprite.warm", 20000)
+def getSpriteWarm():
+    manager = SpriteManager.getInstance()
+    manager.getSprite("chars.png", (0,0))
+    return lambda: manager.getSprite("chars.png", (40, 3))
+
+
+@benchmark("getHud", 500)
+def getHud():
+    return lambda: HudBuilder.getHud(40, 50, 12)
+
+@benchmark("Hud.update", 20000)
+def hudUpdate():
+    hud = Hud()
+    return lambda: hud.update(40, 50, 12)
+
+
+def submitBench(count):
+    def setup():
+        engine = headless.newGame()
+        headless.populate(engine, count)
+        def call():
+            ##  A miss scans every enemy
+            engine.keyBuffer = list("Zzzzzz")
+            engine.submitString()
+        return call
+    return setup
+
+for count in (20, 500):
+    benchmark(f"submitString.{count}", 2000)(submitBench(count))
+
+
+def drawBench(count):
+    def setup():
+        engine = headless.newGame()
+        headless.populate(engine, count)
+        drawSurface = pygame.Surface(list(map(int, RESOLUTION))).convert()
+        return lambda: engine.draw(drawSurface)
+    return setup
+
+for count in (20, 200):
+    benchmark(f"Engine.draw.{count}", 500)(drawBench(count))
+
+
+@benchmark("Enemy.update", 5000)
+def enemyUpdate():
+    e = Walker("Word")
+    def call():
+        e.position[0] = RESOLUTION[0]
+        e.update(1/60)
+    return call
+
+@benchmark("Enemy.draw", 5000)
+def enemyDraw():
+    e = Walker("Word")
+    drawSurface = pygame.Surface(list(map(int, RESOLUTION))).convert()
+    return lambda: e.draw(drawSurface)
+
+def storeBench(count):
+    def setup():
+        engine = headless.newGame()
+        headless.populate(engine, count)
+        store = engine.enemyStore
+        start = store.arrays["position"][:store.count].copy()
+        def call():
+            store.arrays["position"][:store.count] = start
+            store.update(1/60, 0)
+        return call
+    return setup
+
+for count in (200, 2000):
+    benchmark(f"EnemyStore.update.{count}", 2000)(storeBench(count))
+
+@benchmark("Bullet.update", 5000)
+def bulletUpdate():
+    e = Walker("Word")
+    b = Bullet(vec(64, 200), e)
+    return lambda: b.update(1/60)
+
+@benchmark("BulletStore.update.200", 2000)
+def bulletStoreUpdate():
+    engine = headless.newGame()
+    headless.populate(engine, 200)
+    for e in engine.enemies:
+        engine.bulletStore.add(Bullet(vec(64, 200), e))
+    store = engine.bulletStore
+    start = store.arrays["position"][:store.count].copy()
+    def call():
+        ##  Stay short of the targets so nothing is removed
+        store.arrays["position"][:store.count] = start
+        store.update(0, engine.enemyStore)
+    return call
+
+
+def presentBench(mode, scale):
+    def setup():
+        ##  Offscreen, so this is the copy and scale alone;
+        ##  py -m UI.presenter includes the flip on a real window
+        size = Presenter.getWindow(mode, RESOLUTION, scale)[0]
+        drawSurface = pygame.Surface(list(map(int, RESOLUTION))).convert()
+        presenter = Presenter(drawSurface, pygame.Surface(size).convert(), mode)
+        return presenter.present
+    return setup
+
+for mode in Presenter.MODES:
+    for scale in ((1,) if mode == "direct" else (2, 3)):
+        benchmark(f"present.{mode}.x{scale}", 500)(presentBench(mode, scale))
+
+
+##  ----------------------------------------------- ##
+                ##  Running   ##
+
+def timeCall(call, number, repeat):
+    """Return the best time per call in microseconds."""
+    best = float("inf")
+    for i in range(repeat):
+        start = time.perf_counter()
+        for j in range(number):
+            call()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e6
+
+
+def runAll(names = None, repeat = 5):
+    results = {}
+    for name, (setup, number) in BENCHMARKS.items():
+        if names and not any(n in name for n in names):
+            continue
+        call = setup()
+        call()  # Warm up
+        results[name] = {"usPerCall": timeCall(call, number, repeat), "calls": number}
+        print(f"{name:<40} {results[name]['usPerCall']:12.2f} us")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Print each benchmark against the baseline.
+    Returns the names that got slower by more than threshold.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<40} {'-':>12} {result['usPerCall']:12.2f}      new")
+            continue
+        old = baseline[name]["usPerCall"]
+        change = (result["usPerCall"] - old) / old
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<40} {old:12.2f} {result['usPerCall']:12.2f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Run the microbenchmarks.")
+    parser.add_argument("--output", help = "write results to this JSON file")
+    parser.add_argument("--compare", help = "baseline JSON file to compare against")
+    parser.add_argument("--threshold", type = float, default = 0.10,
+                        help = "fractional slowdown that counts as a regression")
+    parser.add_argument("--repeat", type = int, default = 5)
+    parser.add_argument("--filter", nargs = "*", help = "only run benchmarks containing these names")
+    args = parser.parse_args()
+
+    headless.init()
+    results = runAll(args.filter, args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"python": platform.python_version(),
+                       "pygame": pygame.version.ver,
+                       "platform": platform.platform(),
+                       "benchmarks": results}, file, indent = 2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["benchmarks"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
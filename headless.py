@@ -0,0 +1,114 @@
+"""
+Run the game without a window.
+
+Uses SDL's dummy video and audio drivers and a silent SoundManager,
+and drives the Engine with fixed ticks as fast as the CPU allows.
+Useful for measuring update throughput and for running
+gameplay logic in tests and batch jobs.
+
+Usage: py headless.py [--seconds 10] [--tick 60] [--enemies 20 200 2000] [--allocs]
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import time
+import pygame
+
+from objects import Engine
+from UI import SoundManager
+from utils import RESOLUTION, AllocTracker
+
+
+def init():
+    """
+    Initialize pygame with a hidden display
+    so images can still be converted.
+    """
+    pygame.init()
+    pygame.display.set_mode(list(map(int, RESOLUTION)))
+    SoundManager.setSilent()
+
+
+def newGame(spawnRate = 1.5):
+    """
+    Return an engine that is already in gameplay.
+    """
+    engine = Engine(spawnRate)
+    engine.enterGame()
+    return engine
+
+
+def populate(engine, count):
+    """
+    Spawn enemies until the engine has count of them,
+    spread out along the spawn edge so they don't all arrive at once.
+    """
+    while len(engine.enemies) < count:
+        engine.spawn()
+        e = engine.enemies[-1]
+        e.position[0] += (len(engine.enemies) % 64) * e.getLength()
+
+
+def run(engine, seconds, tick = 60, keys = None, enemies = None, drawSurf = None):
+    """
+    Simulate seconds of gameplay in fixed ticks.
+
+    Params:
+    tick    -> ticks per simulated second
+    keys    -> optional function(tickNumber) returning the keys typed that tick
+    enemies -> if given, top the enemy count back up to this after every tick
+    drawSurf -> if given, draw every tick onto it
+
+    Returns the number of ticks, the wall time, and ticks per second.
+    """
+    dt = 1 / tick
+    ticks = int(seconds * tick)
+
+    start = time.perf_counter()
+    for i in range(ticks):
+        engine.step(dt, keys(i) if keys else "")
+        if enemies:
+            populate(engine, enemies)
+        if drawSurf:
+            engine.draw(drawSurf)
+            if AllocTracker.installed:
+                AllocTracker.endFrame()
+    wall = time.perf_counter() - start
+
+    return {"ticks": ticks,
+            "seconds": wall,
+            "ticksPerSecond": ticks / wall if wall else float("inf")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Measure headless update throughput.")
+    parser.add_argument("--seconds", type = float, default = 10.0, help = "simulated seconds per run")
+    parser.add_argument("--tick", type = int, default = 60, help = "simulation ticks per second")
+    parser.add_argument("--enemies", type = int, nargs = "+", default = [20, 200, 2000])
+    parser.add_argument("--allocs", action = "store_true",
+                        help = "draw every tick and report allocations per frame")
+    args = parser.parse_args()
+
+    init()
+    drawSurf = None
+    if args.allocs:
+        AllocTracker.install()
+        drawSurf = pygame.Surface(list(map(int, RESOLUTION)))
+
+    for count in args.enemies:
+        engine = newGame()
+        populate(engine, count)
+        AllocTracker.frames.clear()
+        result = run(engine, args.seconds, args.tick, enemies = count, drawSurf = drawSurf)
+        print(f"{count:>6} enemies: {result['ticksPerSecond']:10.1f} ticks/sec "
+              f"({result['ticks']} ticks in {result['seconds']:.2f}s)")
+        if args.allocs:
+            print(AllocTracker.formatSummary())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 import pygame
 from utils import vec
 from objects import Engine
-from UI import EventManager
-from utils import RESOLUTION, UPSCALED
+from UI import EventManager, SpriteManager, DirtyRenderer, Presenter
+from utils import RESOLUTION, SCALE, TICK_RATE, FRAME_RATE, DIRTY_RECTS, PRESENT_MODE, TRACK_ALLOCS, SHOW_TIMINGS, GameLoop, AllocTracker
 
 import asyncio
 
@@ -12,10 +12,15 @@ import asyncio
 pygame.init()
 pygame.font.init()
 
+#   Count allocations per frame
+if TRACK_ALLOCS:
+    AllocTracker.install()
+
 #   Set the screen up
-flags = pygame.SCALED #| pygame.NOFRAME | pygame.FULLSCREEN
-screen = pygame.display.set_mode(list(map(int, UPSCALED)), flags=flags)
+flags = 0 #| pygame.NOFRAME | pygame.FULLSCREEN
+screen = Presenter.openWindow(PRESENT_MODE, RESOLUTION, SCALE, flags)
 drawSurface = pygame.Surface(list(map(int, RESOLUTION)))
+presenter = Presenter(drawSurface, screen, PRESENT_MODE)
 
 #   Set mouse visible
 pygame.mouse.set_visible(True)
@@ -26,54 +31,92 @@ image = pygame.image.load("displayIcon.png").convert()
 iconSurf.blit(image, (0,0))
 pygame.display.set_icon(iconSurf)
 
-#   Initialize the engine and eventManager
+#   Start decoding images behind the logo
+SpriteManager.getInstance().preload()
+
+#   Initialize the engine and eventManager.
+#   The engine only needs the logo until the rest are loaded
 gameEngine = Engine()
 #eventManager = EventManager()
 RUNNING = True
 
-async def main():
+#   Fixed-timestep loop
+gameLoop = GameLoop(TICK_RATE, FRAME_RATE)
+
+#   Optional dirty-rect renderer
+renderer = DirtyRenderer(drawSurface, presenter) if DIRTY_RECTS else None
+
+def tick(seconds):
+    """
+    Advance the game by one fixed tick.
+    """
+    if EventManager.startup:
+        if EventManager.transitioning:
+            if gameEngine.fade_on == False:
+                EventManager.startup = False
+                EventManager.transitioning = False
+                gameEngine.fade_off = True
+
+        else:
+            EventManager.updateTimer(seconds, gameEngine)
+    
+    EventManager.updateBuffer(seconds) 
     
+    #   Without the logo screen, the title waits for the images
+    if EventManager.ready and (gameEngine.loaded or EventManager.startup):
+        gameEngine.update(seconds)
+
+async def main():
+    frames = 0
+
     while RUNNING:
-        
-        #   Draw
-        pygame.transform.scale(drawSurface,
-                            list(map(int, UPSCALED)),
-                            screen)
-        pygame.display.flip()
+        gameLoop.beginFrame()
 
-        if EventManager.startup:
-            gameEngine.drawLogo(drawSurface)
-        else:
-            gameEngine.draw(drawSurface)
-        gameEngine.drawFade(drawSurface)
-        
+        #   Finish loading images as they're decoded,
+        #   without catching up on the frame that finished them
+        if not gameEngine.loaded and gameEngine.finishLoading():
+            print(f"Loaded images in {SpriteManager.getInstance().loadTime * 1000:.0f} ms")
+            gameLoop.reset()
 
         #   Handle events
-        EventManager.handleEvents(gameEngine)
+        if gameEngine.loaded or EventManager.startup:
+            EventManager.handleEvents(gameEngine)
+        elif pygame.event.get(pygame.QUIT):
+            break
 
         #   Update
-        gameClock = pygame.time.Clock()
-        
         if EventManager.readyToUpdate():
-            
-            gameClock.tick(60)
-            seconds = gameClock.get_time() / 1000
-
-            if EventManager.startup:
-                if EventManager.transitioning:
-                    if gameEngine.fade_on == False:
-                        EventManager.startup = False
-                        EventManager.transitioning = False
-                        gameEngine.fade_off = True
-
-                else:
-                    EventManager.updateTimer(seconds, gameEngine)
-            
-            EventManager.updateBuffer(seconds) 
-            
-            if EventManager.ready:
-                gameEngine.update(seconds)
-        await asyncio.sleep(0)
+            for seconds in gameLoop.ticks():
+                tick(seconds)
+
+        #   Draw
+        target = renderer.begin() if renderer else drawSurface
+        if EventManager.startup or not gameEngine.loaded:
+            gameEngine.drawLogo(target)
+        else:
+            gameEngine.draw(target, gameLoop.alpha)
+        gameEngine.drawFade(target)
+
+        if renderer:
+            renderer.end()
+        else:
+            presenter.present()
+            pygame.display.flip()
+
+        #   Print the frame and tick times every few seconds
+        if SHOW_TIMINGS:
+            frames += 1
+            if frames % gameLoop.window == 0:
+                print(gameLoop.formatStats())
+
+        #   Print the allocations every few seconds
+        if TRACK_ALLOCS:
+            AllocTracker.endFrame()
+            if len(AllocTracker.frames) == AllocTracker.WINDOW:
+                print(AllocTracker.formatSummary())
+                AllocTracker.frames.clear()
+
+        await asyncio.sleep(gameLoop.getSleep())
         
     #   Quit if not running
     pygame.quit()
@@ -1,4 +1,9 @@
 from .drawable import *
+from .arrayStore import *
+from .animationClip import *
 from .animated import *
+from .enemyStore import *
+from .bulletStore import *
 from .enemy import *
+from .spawnLane import *
 from .engine import *
\ No newline at end of file
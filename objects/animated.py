@@ -1,47 +1,56 @@
 from . import Drawable
+from .arrayStore import Column, Stored
+from .animationClip import AnimationClip
 from utils import vec
-from UI import SpriteManager
 import numpy as np
 
 class Animated(Drawable):
+    """
+    A Drawable that plays AnimationClips.
+    A type's animations are listed in STATES and shared by
+    every instance; each instance only keeps its clip,
+    frame index, and timer.
+    """
+
+    #   State name -> (fileName, nFrames, fps, offset)
+    STATES = {}
+
     def __init__(self, position: tuple = vec(0,0), fileName: str ="", offset: tuple =(0,0), nFrames: int = 1, fps: int = 16, scale=False):
         if scale:
             super().__init__(position, fileName, offset, scale=True)
         else:
             super().__init__(position, fileName, offset)
-        self.fileName = fileName
-        self.nFrames = nFrames
-        self.fps = fps
-        self.frameCount = 0
-        self.row = offset[0]
-        self.column = offset[1]
+
+        base = AnimationClip.get(fileName, nFrames, fps, column = offset[1])
+        self.clips = AnimationClip.getSet(type(self), base)   #  Maps states to their clips
+        self.clip = base
+        self.frame = offset[0]
         self.timer = 0.0
 
-        self.states = {"base":[fileName, nFrames, fps, vec(0,0)]} #  Maps states to their nFrames and fps
         self.state = "base"
         self.playing = False
         self.previous = "base"
 
     
-    def addState(self, name : str, fileName: str, nFrames: int, fps: int, offset: tuple = vec(0,0)):
+    def addState(self, name : str, fileName: str, nFrames: int, fps: int, offset: tuple = (0,0)):
         """
-        Adds a new animation for a given state.
-        Indices for each state in self.states:
-        0 -> fileName, 1 -> nFrames, 2 -> fps
+        Adds a new animation for a given state
+        to this object only. Types list theirs in STATES.
         """
-        self.states[name] = [fileName, nFrames, fps, offset]
+        self.clips = dict(self.clips)
+        self.clips[name] = AnimationClip.get(fileName, nFrames, fps, offset)
     
     def change_state(self, state : str):
-        if state in self.states:
+        if state in self.clips:
             ##  Change states
             self.state = state
+            self.clip = self.clips[state]
 
             ##  Reset Animation
-            self.row = 0
-            self.column = 0
+            self.frame = 0
 
             ##  Update the image
-            self.image = (SpriteManager.getInstance().getSprite(self.states[self.state][0], (self.row, self.column)))
+            self.image = self.clip.frames[0]
 
     def play_animation(self, state="base", loop = False):
         """
@@ -51,47 +60,88 @@ class Animated(Drawable):
         state -> tells Animated which animation to play
         loop  -> if True, continues playing the same animation after one loop. Else, return to the base animation
         """
-        if state in self.states:
+        if state in self.clips:
             self.previous = self.state #Store previous state
             self.playing = True
             self.looping = loop
             self.change_state(state)
 
     def draw(self, drawSurface, drawHitbox=False, use_camera=True):
-        super().draw(drawSurface, offset=self.states[self.state][3])
+        super().draw(drawSurface, offset=self.clip.offset)
 
     def update(self, seconds, scale = False):
+        """
+        Advance the animation by seconds.
+        Leftover time carries into the next update, and a long
+        update advances as many frames as fit in it, firing
+        onFrame for each one and onEnd when a played animation ends.
+        """
         super().update(seconds)
 
         self.timer += seconds
-        if self.timer >= 1 / self.states[self.state][2]:
-            self.timer = 0.0
-            self.row += 1
-            self.row %= self.states[self.state][1]
-            
+        period = 1 / self.clip.fps
+        if self.timer < period:
+            return
+
+        while self.timer >= period:
+            self.timer -= period
+            self.frame += 1
+            self.frame %= len(self.clip.frames)
+            self.onFrame(self.frame)
+
             ##  Stop playing Animation
-            if self.playing and self.row == 0:
+            if self.playing and self.frame == 0:
+                state = self.state
                 self.playing = False
                 if not self.looping:
                     self.change_state(self.previous)
-                    self.image = SpriteManager.getInstance().getSprite(self.states[self.state][0], (0, 0))
                     self.looping = False
-                return
-            
-            self.image = SpriteManager.getInstance().getSprite(self.states[self.state][0], (self.row, self.column))
+                self.onEnd(state)
+                period = 1 / self.clip.fps
+
+        self.image = self.clip.frames[self.frame]
+
+    def onFrame(self, frame : int):
+        """
+        Called each time the animation reaches a new frame.
+        """
+        return
+
+    def onEnd(self, state : str):
+        """
+        Called when an animation started by
+        play_animation finishes its first loop.
+        """
+        return
 
 
         
-class Bullet(Animated):
+class Bullet(Stored, Animated):
+    """
+    A homing bullet.
+    Once added to a BulletStore, its position, velocity,
+    and target live in the store, which steers every bullet at once.
+    """
+
+    #   Columns moved into the BulletStore
+    position = Column("position")
+    vel      = Column("velocity")
+    target   = Column("target", int)
+
+    ##  Speed Attributes
+    SPEED = 50
+    MAX_SPEED = 300
+
     def __init__(self, position: tuple = vec(0, 0), enemy = None):
         super().__init__(position, "bullet.png", (0,0), 3, 16)
 
         ##  Keeps track of the enemy for homing properties
         self.enemy = enemy
+        self.target = -1
 
         ##  Speed Attributes
-        self.speed = 50
-        self.max_speed = 300
+        self.speed = Bullet.SPEED
+        self.max_speed = Bullet.MAX_SPEED
 
         ##  Set Velocity
         self.set_velocity()
@@ -103,26 +153,11 @@ class Bullet(Animated):
         Steers the bullet and keeps the velocity
         below the maximum speed
         """
-
-        ##  Calculate the slope of the line pointing from the bullet to the enemy
-        self.vel = (self.enemy.position - self.position) * self.speed
-        
-        ##  Adjust the velocity according to the maximum speed
-        if self.vel[0] < 0:
-            self.vel[0] = -self.max_speed if self.vel[0] < -self.max_speed else self.vel[0]
-
-        elif self.vel[0] > 0:
-            self.vel[0] = self.max_speed if self.vel[0] > self.max_speed else self.vel[0]
-
-        if self.vel[1] < 0:
-            self.vel[1] = -self.max_speed if self.vel[1] < -self.max_speed else self.vel[1]
-
-        elif self.vel[1] > 0:
-            self.vel[1] = self.max_speed if self.vel[1] > self.max_speed else self.vel[1]
-
-        
+        self.vel = np.clip((self.enemy.position - self.position) * self.speed, -self.max_speed, self.max_speed)
 
     def update(self, seconds):
+        """
+        Animate the bullet.
+        Homing and movement are done by the BulletStore.
+        """
         super().update(seconds)
-        self.set_velocity()
-        self.position += self.vel * seconds
\ No newline at end of file
@@ -0,0 +1,60 @@
+from utils import Vec2
+from UI import SpriteManager
+
+"""
+Animations shared between every instance of a type.
+"""
+
+class AnimationClip(object):
+    """
+    One animation: its frames, looked up once,
+    its fps, and the offset to draw it at.
+    Clips are shared, so they shouldn't be changed once made.
+    Since clips keep their frames, their sheets are pinned in
+    the SpriteManager so the cache never evicts them.
+    """
+
+    __slots__ = ("fileName", "frames", "fps", "offset")
+
+    #   Every clip made, by (fileName, nFrames, fps, offset, column)
+    _CLIPS = {}
+
+    #   Clip sets by (class, base clip)
+    _SETS = {}
+
+    def get(fileName, nFrames, fps, offset = (0,0), column = 0):
+        """
+        Return the clip for these frames of a sheet,
+        making it the first time it's asked for.
+        """
+        key = (fileName, nFrames, fps, tuple(map(float, offset)), column)
+        clip = AnimationClip._CLIPS.get(key)
+        if clip == None:
+            clip = AnimationClip(*key)
+            AnimationClip._CLIPS[key] = clip
+        return clip
+
+    def getSet(cls, base):
+        """
+        Return the shared dict of state name -> clip
+        for a class, made from its STATES and a base clip.
+        """
+        key = (cls, base)
+        clips = AnimationClip._SETS.get(key)
+        if clips == None:
+            clips = {"base": base}
+            for name, spec in cls.STATES.items():
+                clips[name] = AnimationClip.get(*spec)
+            AnimationClip._SETS[key] = clips
+        return clips
+
+    def __init__(self, fileName, nFrames, fps, offset = (0,0), column = 0):
+        manager = SpriteManager.getInstance()
+        manager.pin(fileName)
+        self.fileName = fileName
+        self.frames = tuple(manager.getSprite(fileName, (i, column)) for i in range(nFrames))
+        self.fps = fps
+        self.offset = Vec2(*offset)
+
+    def __len__(self):
+        return len(self.frames)
@@ -0,0 +1,251 @@
+import numpy as np
+
+"""
+Struct-of-arrays storage.
+An ArrayStore keeps some of its objects' attributes in
+contiguous NumPy arrays so they can be updated
+for every object at once.
+"""
+
+
+class Column(object):
+    """
+    A descriptor that keeps an attribute in a column of
+    whichever ArrayStore the object is in, and on the
+    object while it isn't stored.
+    Vector columns return a view of the object's row.
+    """
+
+    def __init__(self, column, kind = None):
+        self.column = column
+        self.kind = kind
+
+    def __set_name__(self, owner, name):
+        self.attr = name
+
+    def __get__(self, obj, owner = None):
+        if obj is None:
+            return self
+        store = obj._store
+        if store is None:
+            return obj.__dict__[self.attr]
+        value = store.arrays[self.column][obj._index]
+        return self.kind(value) if self.kind else value
+
+    def __set__(self, obj, value):
+        store = obj._store
+        if store is None:
+            obj.__dict__[self.attr] = value
+        else:
+            store.arrays[self.column][obj._index] = value
+
+
+class Stored(object):
+    """
+    Mixin for objects kept in an ArrayStore.
+    """
+    _store = None
+    _index = None
+    _handle = None
+
+    def getRenderPosition(self):
+        """
+        Return the position to draw at,
+        interpolated between the last two ticks.
+        """
+        if self._store is None:
+            return self.position
+        rows = self._store.renderRows
+        if rows is not None:
+            return rows[self._index]
+        return self._store.arrays["render"][self._index]
+
+
+class ArrayStore(object):
+    """
+    Keeps each stored object's Column attributes
+    as one row of the store's arrays.
+
+    Every stored object gets a handle: a slot number tagged with
+    the slot's generation. Handles stay valid while rows move and
+    go stale once the object is removed, so other stores can refer
+    to objects by handle.
+
+    Objects are added with add(). discard() queues an object for
+    removal, and flush() removes the queue at the end of a tick,
+    swapping the last row into each hole.
+
+    Stores with a position column also keep each row's position
+    from the previous tick, for render interpolation.
+    """
+
+    #   Column name -> (shape of one row, dtype)
+    COLUMNS = {}
+
+    #   Handles: the low bits are the slot, the high bits its generation
+    SLOT_BITS = 24
+    SLOT_MASK = (1 << SLOT_BITS) - 1
+
+    #   Column layout of each stored class
+    _LAYOUTS = {}
+
+    def __init__(self, capacity = 64):
+        self.count = 0
+        self.entities = []
+        self.arrays = {name: np.zeros((capacity,) + shape, dtype)
+                       for name, (shape, dtype) in type(self).COLUMNS.items()}
+
+        ##  Positions at the previous tick and to draw at
+        if "position" in self.arrays:
+            self.arrays["previous"] = np.zeros_like(self.arrays["position"])
+            self.arrays["render"] = np.zeros_like(self.arrays["position"])
+
+        ##  Render positions as lists of floats, made once per interpolate
+        ##  so drawing doesn't index the array per object. None when stale.
+        self.renderRows = None
+
+        ##  The slot of each row, and the row and generation of each slot
+        self.arrays["slot"] = np.zeros(capacity, int)
+        self.slotRow = np.full(capacity, -1, int)
+        self.slotGeneration = np.zeros(capacity, int)
+        self.freeSlots = []
+        self.slotCount = 0
+
+        ##  Objects waiting to be removed by flush()
+        self.pending = {}
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        for name, array in self.arrays.items():
+            bigger = np.zeros((len(array) * 2,) + array.shape[1:], array.dtype)
+            bigger[:self.count] = array[:self.count]
+            self.arrays[name] = bigger
+
+    def _newSlot(self):
+        if self.freeSlots:
+            return self.freeSlots.pop()
+
+        if self.slotCount == len(self.slotRow):
+            self.slotRow = np.concatenate((self.slotRow, np.full(len(self.slotRow), -1, int)))
+            self.slotGeneration = np.concatenate((self.slotGeneration, np.zeros(len(self.slotGeneration), int)))
+
+        self.slotCount += 1
+        return self.slotCount - 1
+
+    def _columns(self, obj):
+        """Return (column, attribute) pairs for obj's class."""
+        cls = type(obj)
+        if cls not in ArrayStore._LAYOUTS:
+            ArrayStore._LAYOUTS[cls] = [(attr.column, attr.attr) for klass in cls.__mro__
+                                        for attr in vars(klass).values() if isinstance(attr, Column)]
+        return ArrayStore._LAYOUTS[cls]
+
+    def add(self, obj):
+        """
+        Move an object's columns into the store
+        and give it a handle.
+        """
+        if self.count == len(self.arrays["slot"]):
+            self._grow()
+
+        index = self.count
+        self.renderRows = None
+        for column, attr in self._columns(obj):
+            self.arrays[column][index] = obj.__dict__.pop(attr)
+
+        if "previous" in self.arrays:
+            self.arrays["previous"][index] = self.arrays["position"][index]
+            self.arrays["render"][index] = self.arrays["position"][index]
+
+        slot = self._newSlot()
+        self.arrays["slot"][index] = slot
+        self.slotRow[slot] = index
+
+        obj._store = self
+        obj._index = index
+        obj._handle = slot | (int(self.slotGeneration[slot]) << ArrayStore.SLOT_BITS)
+        self.entities.append(obj)
+        self.count += 1
+
+    def discard(self, obj):
+        """
+        Queue an object for removal at the next flush().
+        """
+        self.pending[obj] = None
+
+    def flush(self):
+        """
+        Remove every discarded object.
+        """
+        for obj in self.pending:
+            self.remove(obj)
+        self.pending.clear()
+
+    def remove(self, obj):
+        """
+        Move an object's columns back onto it, retire its handle,
+        and fill its row with the last row.
+        """
+        index = obj._index
+        last = self.count - 1
+        self.renderRows = None
+
+        for column, attr in self._columns(obj):
+            value = self.arrays[column][index]
+            obj.__dict__[attr] = value.copy() if value.shape else value.item()
+        obj._store = None
+        obj._index = None
+
+        slot = self.arrays["slot"][index]
+        self.slotRow[slot] = -1
+        self.slotGeneration[slot] += 1
+        self.freeSlots.append(slot)
+
+        if index != last:
+            for array in self.arrays.values():
+                array[index] = array[last]
+            self.slotRow[self.arrays["slot"][index]] = index
+            moved = self.entities[last]
+            moved._index = index
+            self.entities[index] = moved
+
+        self.entities.pop()
+        self.count -= 1
+
+    def snapshot(self):
+        """
+        Remember every position before a tick moves them.
+        """
+        n = self.count
+        self.arrays["previous"][:n] = self.arrays["position"][:n]
+
+    def interpolate(self, alpha):
+        """
+        Set every render position alpha of the way
+        from the previous tick's position to the current one.
+        """
+        n = self.count
+        previous = self.arrays["previous"][:n]
+        np.add(previous, (self.arrays["position"][:n] - previous) * alpha, out = self.arrays["render"][:n])
+        self.renderRows = self.arrays["render"][:n].tolist()
+
+    def resolve(self, handles):
+        """
+        Return the row of each handle in an array,
+        or -1 where the handle is stale.
+        """
+        slots = handles & ArrayStore.SLOT_MASK
+        rows = self.slotRow[slots]
+        return np.where(self.slotGeneration[slots] == handles >> ArrayStore.SLOT_BITS, rows, -1)
+
+    def get(self, handle):
+        """
+        Return the object a handle refers to,
+        or None if it has been removed.
+        """
+        slot = handle & ArrayStore.SLOT_MASK
+        if slot >= self.slotCount or self.slotGeneration[slot] != handle >> ArrayStore.SLOT_BITS:
+            return None
+        return self.entities[self.slotRow[slot]]
@@ -0,0 +1,55 @@
+import numpy as np
+from .arrayStore import ArrayStore
+from .animated import Bullet
+
+"""
+Bullet homing and hits for every bullet at once.
+"""
+
+class BulletStore(ArrayStore):
+    """
+    Holds every bullet's position, velocity, and
+    the EnemyStore handle of its target.
+    """
+
+    #   Column name -> (shape of one row, dtype)
+    COLUMNS = {
+        "position": ((2,), float),
+        "velocity": ((2,), float),
+        "target":   ((), int),
+    }
+
+    def add(self, b):
+        """
+        Store a bullet, aimed at its enemy's handle.
+        """
+        b.target = b.enemy._handle
+        super().add(b)
+
+    def update(self, seconds, enemies):
+        """
+        Steer every bullet toward its target and move it.
+        Bullets that reached their target, or whose target
+        is gone, are discarded.
+        Returns the enemies that were hit.
+        """
+        n = self.count
+        if n == 0:
+            return []
+
+        position = self.arrays["position"][:n]
+        velocity = self.arrays["velocity"][:n]
+        rows = enemies.resolve(self.arrays["target"][:n])
+        lost = rows < 0
+        goal = enemies.arrays["position"][np.maximum(rows, 0)]
+
+        ##  Home in, keeping the velocity below the maximum speed
+        np.clip((goal - position) * Bullet.SPEED, -Bullet.MAX_SPEED, Bullet.MAX_SPEED, out = velocity)
+        position += velocity * seconds
+
+        ##  Resolve hits
+        hits = ~lost & (position[:, 0] >= goal[:, 0])
+        for i in np.flatnonzero(hits | lost):
+            self.discard(self.entities[i])
+
+        return list(dict.fromkeys(enemies.entities[row] for row in rows[hits]))
@@ -1,5 +1,5 @@
 from typing import Any
-from utils import SCALE, RESOLUTION, vec, rectAdd
+from utils import SCALE, RESOLUTION, vec, Vec2, rectAdd
 from UI import SpriteManager
 import pygame
 
@@ -55,7 +55,7 @@ class Drawable(object):
         self.imageName = fileName
         self.block = False
 
-    def draw(self, drawSurface, drawHitbox = False, use_camera = False, offset = vec(0,0)):
+    def draw(self, drawSurface, drawHitbox = False, use_camera = False, offset = Vec2(0,0)):
         """
         Blit's the object's image to the drawSurface.
 
@@ -64,17 +64,23 @@ class Drawable(object):
         use_camera -> draws the object according to the camera offset if True
         offset     -> draws the object according to a specific offset
         """
+        position = self.getRenderPosition()
         if use_camera:
-            drawSurface.blit(self.image, list(map(int, self.position - Drawable.CAMERA_OFFSET)))
-        else:
-            drawSurface.blit(self.image, list(map(int, self.position - offset)) )
+            offset = Drawable.CAMERA_OFFSET
+        drawSurface.blit(self.image, (int(position[0] - offset[0]), int(position[1] - offset[1])))
             
         if drawHitbox:
             collision = rectAdd(-Drawable.CAMERA_OFFSET, self.getCollisionRect())
             pygame.draw.rect(drawSurface, (255,255,255), collision, 1)
 
+    def getRenderPosition(self):
+        """
+        Returns the position to draw the object at.
+        """
+        return self.position
+
     def getSize(self):
-        return vec(*self.image.get_size())
+        return Vec2(*self.image.get_size())
     
     def getCenterX(self):
         """
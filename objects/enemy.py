@@ -2,17 +2,32 @@ import pygame
 from abc import abstractmethod
 from typing import Any, override
 from . import Animated
-from utils import RESOLUTION, FLOOR, vec
+from .arrayStore import Column, Stored
+from utils import RESOLUTION, FLOOR, vec, Vec2
 from UI import SoundManager, SpriteManager, WordManager
 
 from random import randint
 
-class Enemy(Animated):
+class Enemy(Stored, Animated):
     """
     An Abstract Enemy Class.
     Specifies an enemy's states,
     how to draw them, and how to update them.
+    Movement state lives in an EnemyStore
+    once the enemy has been added to one.
     """
+
+    #   Columns moved into the EnemyStore
+    position  = Column("position")
+    vel       = Column("velocity")
+    speed     = Column("speed", float)
+    turn_timer = Column("timer", float)
+    dead      = Column("dead", bool)
+    dying     = Column("dying", bool)
+    attacking = Column("attacking", bool)
+    diving    = Column("diving", bool)
+    flyer     = Column("flyer", bool)
+
     def __init__(self, position, fileName="", offset = (0,0), velocity = vec(-50,0), nFrames = 1, fps = 16, color = (255,255,255), string="", attack_frame = 0, deaths = 0):
         """
         Initialize all of the enemy's variables.
@@ -26,12 +41,14 @@ class Enemy(Animated):
         self.attack_frame = attack_frame
         self.death_tick = 0
         self.max_tick = deaths
+        self.speed = 0.0
+        self.turn_timer = 0.0
+        self.flyer = False
+        self.diving = False
 
         #   Text Vars
-        self.textRow = 0
-        self.textTimer = 0.0
         self.string = string
-        self.textSurf = None
+        self.text = None
         self.text_length = 0
 
         #   States
@@ -80,72 +97,77 @@ class Enemy(Animated):
     
     def buildString(self):
         """
-        Build the enemy's text surface.
+        Build the enemy's colour-cycling text.
+        """
+        self.text = WordManager.buildCycle(self.string, self.getTextRow())
+        self.text_length = self.text.getLength()
+
+    def getTextRow(self):
+        """
+        Return the first colour row of the enemy's text.
         """
         if self.sniped:
-            self.textSurf, self.text_length = WordManager.buildText(self.string, self.textRow + 8)
-        
-        else:
-            self.textSurf, self.text_length = WordManager.buildText(self.string, self.textRow)
+            return 8
+        return 0
 
 
-    def draw(self, drawSurface, drawHitbox=False, use_camera=False):
+    def draw(self, drawSurface, drawHitbox=False, use_camera=False, highlight = 0):
         """
         Blit the enemy onto
         the drawSurface.
+        highlight -> number of leading letters the player has typed
         """
         if self.dead:
             return
         else:
             super().draw(drawSurface, drawHitbox, use_camera)
             if not self.dying:
-                drawSurface.blit(self.textSurf, vec(self.position[0] + 8 - self.text_length//2, self.position[1] - 24))
+                render = self.getRenderPosition()
+                position = Vec2(render[0] + 8 - self.text_length//2, render[1] - 24)
+
+                ##  Typed letters in the buffer's colours
+                text = self.text
+                if highlight:
+                    text = WordManager.buildCycle(self.string, self.getTextRow(), highlight = highlight)
+                drawSurface.blit(text.getSurface(WordManager.TEXT_PHASE), position)
 
                 
     def update(self, seconds, key = None):
-        #   Death States
+        """
+        Animate the enemy.
+        Movement is done for every enemy at once by the EnemyStore.
+        """
         if self.dead:
             return
-        
-        elif self.dying or self.attacking:
-            if self.playing == False: ## At the end of the death animation
-                self.dead = True
-                return
-            
-            else:
-                super().update(seconds)
-                if self.attacking and not self.attack_done and self.row == self.attack_frame:
-                    self.attack_done = True
-                return
-        
-        #   Update TextRow
-        self.textTimer += seconds
-        if self.textTimer >= 0.2:
-            self.textRow += 1
-            self.textRow %= 4
-            self.textTimer = 0.0
-            self.buildString()
-
-
-        #   Update Position
-        self.position += self.vel * seconds
-
-        #   Animate
         super().update(seconds)
 
-        #   Out of bounds safety
-        if self.position[0] <= 0:
+    def onFrame(self, frame):
+        """
+        Land an attack on its attack frame.
+        """
+        if self.attacking and not self.attack_done and frame == self.attack_frame:
+            self.attack_done = True
+
+    def onEnd(self, state):
+        """
+        The enemy is gone once its death
+        or attack animation has played.
+        """
+        if self.dying or self.attacking:
             self.dead = True
 
 class Walker(Enemy):
+
+    ##  Animations
+    STATES = {
+        "attack":  ("ground_2.png", 27, 16, (57, 142)),
+        "death_1": ("ground_3.png", 26, 32, (57, 142)),
+        "death_2": ("ground_4.png", 10, 32, (57, 142)),
+        "death_3": ("ground_5.png", 17, 32, (57, 142)),
+    }
+
     def __init__(self, string = "a", color = (255,255,255)):
         super().__init__(vec(RESOLUTION[0], RESOLUTION[1] - FLOOR - 16), "ground_1.png", (0,0), velocity=vec(-100,0), nFrames=14, fps=32, color=color, string=string, attack_frame=18, deaths=3)
-        
-        ##  Animations
-        self.addState("attack", "ground_2.png", 27, 16, vec(57, 142))
-        self.addState("death_1", "ground_3.png", 26, 32, vec(57, 142))
-        self.addState("death_2", "ground_4.png", 10, 32, vec(57, 142))
-        self.addState("death_3", "ground_5.png", 17, 32, vec(57, 142))
 
 
     @override
@@ -184,33 +206,28 @@ class Walker(Enemy):
 
 
 class Flyer(Enemy):
+
+    ##  Animations
+    STATES = {
+        "dive":    ("flyer_2.png", 22, 16, (0, 0)),
+        "explode": ("flyer_4.png", 17, 64, (23, 21)),
+        "death_1": ("flyer_3.png", 19, 32, (115, 54)),
+        "death_2": ("flyer_5.png", 17, 32, (51, 30)),
+        "death_3": ("flyer_6.png", 25, 32, (74, 30)),
+    }
+
     def __init__(self, string = "a", color=(255, 255, 255), speed = 75):
         super().__init__(vec(RESOLUTION[0], 64), "flyer_1.png", (0,0), color=color, string=string, attack_frame=12)
 
         ##  Attributes and Counters
+        self.flyer = True
         self.diving = False
         self.speed = speed
 
-        self.frame_counter = 0  #   Change vel every few frames
+        self.turn_timer = 0.0  #   Change vel every third of a second
         self.dive_tick = 0
 
         self.vel = vec(-self.speed, self.speed)
-        
-        
-        ##  Animations
-        self.addState("dive", "flyer_2.png", 22, 16, vec(0, 0))
-        self.addState("explode", "flyer_4.png", 17, 64, vec(23, 21))
-
-        self.addState("death_1", "flyer_3.png", 19, 32, vec(115, 54))
-
-        self.addState("death_2", "flyer_5.png", 17, 32, vec(51, 30))
-        self.addState("death_3", "flyer_6.png", 25, 32, vec(74, 30))
-
-    def setVelocity(self):
-        if self.vel[1] > 0:
-            self.vel = vec(-self.speed, -self.speed)
-        else:
-            self.vel = vec(-self.speed, self.speed)
 
     @override
     def attack(self):
@@ -244,39 +261,6 @@ class Flyer(Enemy):
     def getDamage(self):
         return 8
 
-    @override
-    def update(self, seconds, key=None):
-
-        #   Flyers move in a V shape and then dive for the player
-        if not self.diving and not self.dying:
-            self.frame_counter += 1
-            if self.frame_counter == 20:
-
-                ##  Reset the frame counter
-                ##  Increment the dive tick
-                self.frame_counter = 0
-                
-                if self.position[0] <= 250:
-
-                    ##   Dive
-                    self.diving = True
-                    self.change_state("dive")
-
-                    d_x = self.position[0] - 16*3
-                    d_y = self.position[1] - (RESOLUTION[1] - (FLOOR + 16))
-                    
-                    
-                    self.vel = vec(-d_x, -d_y)
-                    #self.vel = vec(-self.speed, self.speed)
-                
-                else:
-
-                    ##  Change the velocity
-                    self.setVelocity()
-        
-        ##  Proceed with regular update routine
-        super().update(seconds)
-    
     
 class Sniper(Walker):
     """
@@ -290,8 +274,8 @@ class Sniper(Walker):
         self.image.set_alpha(0)
 
     @override
-    def buildString(self):
-        self.textSurf, self.text_length = WordManager.buildText(self.string, self.textRow+8)
+    def getTextRow(self):
+        return 8
 
 class Builder():
     def __call__(self, *args: Any, **kwds: Any) -> Any:
@@ -0,0 +1,80 @@
+import numpy as np
+from utils import RESOLUTION, FLOOR
+from .arrayStore import ArrayStore
+
+"""
+Enemy movement for every enemy at once.
+"""
+
+class EnemyStore(ArrayStore):
+    """
+    Holds every live enemy's movement state in arrays
+    and updates them with one vectorized pass per frame.
+    """
+
+    #   Column name -> (shape of one row, dtype)
+    COLUMNS = {
+        "position":  ((2,), float),
+        "velocity":  ((2,), float),
+        "speed":     ((), float),
+        "timer":     ((), float),
+        "dead":      ((), bool),
+        "dying":     ((), bool),
+        "attacking": ((), bool),
+        "diving":    ((), bool),
+        "flyer":     ((), bool),
+    }
+
+    #   Flyers change direction every TURN_TIME seconds
+    #   and dive once they are left of DIVE_X
+    TURN_TIME = 1 / 3
+    DIVE_X = 250
+
+    def update(self, seconds, attackX):
+        """
+        Steer flyers, move every enemy that isn't dying or attacking,
+        kill enemies that left the screen, and start the attack of
+        any enemy that reached attackX.
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        position = self.arrays["position"][:n]
+        velocity = self.arrays["velocity"][:n]
+        speed = self.arrays["speed"][:n]
+        timer = self.arrays["timer"][:n]
+        dead = self.arrays["dead"][:n]
+        diving = self.arrays["diving"][:n]
+
+        moving = ~(dead | self.arrays["dying"][:n] | self.arrays["attacking"][:n])
+
+        #   Flyers move in a V shape and then dive for the player
+        steering = moving & self.arrays["flyer"][:n] & ~diving
+        timer[steering] += seconds
+        turn = steering & (timer >= EnemyStore.TURN_TIME)
+        timer[turn] = 0.0
+
+        dive = turn & (position[:, 0] <= EnemyStore.DIVE_X)
+        flip = turn & ~dive
+
+        velocity[flip, 1] = np.where(velocity[flip, 1] > 0, -speed[flip], speed[flip])
+        velocity[flip, 0] = -speed[flip]
+
+        if dive.any():
+            velocity[dive, 0] = -(position[dive, 0] - 16*3)
+            velocity[dive, 1] = -(position[dive, 1] - (RESOLUTION[1] - (FLOOR + 16)))
+            diving |= dive
+            for i in np.flatnonzero(dive):
+                self.entities[i].change_state("dive")
+
+        #   Update Position
+        position[moving] += velocity[moving] * seconds
+
+        #   Out of bounds safety
+        out = moving & (position[:, 0] <= 0)
+        dead |= out
+
+        #   Attack the player
+        for i in np.flatnonzero(moving & ~out & (position[:, 0] <= attackX)):
+            self.entities[i].attack()
@@ -1,10 +1,10 @@
-from pygame import Rect, Surface, draw, transform
+from pygame import Rect, Surface, draw
 from pygame.font import SysFont
 from random import randint
 
-from . import Drawable, Animated, Walker, Sniper, Flyer, Bullet
-from UI import SoundManager, SpriteManager, WordManager, EventManager, HudBuilder
-from utils import RESOLUTION, FLOOR, vec
+from . import Drawable, Animated, Walker, Sniper, Flyer, Bullet, EnemyStore, BulletStore, SpawnLane
+from UI import SoundManager, SpriteManager, WordManager, EventManager, Hud, RenderQueue
+from utils import RESOLUTION, FLOOR, vec, Vec2, PrefixTrie
 
 class Engine:
     """
@@ -12,8 +12,23 @@ class Engine:
     Each frame, it draws the game in its current state,
     handles input from the user,
     and updates the objects in the game.
+    All timing is in seconds, so the game plays
+    the same at any tick rate.
     """
 
+    #   Fade speed in alpha per second
+    FADE_SPEED = 300
+
+    #   Invincibility after being hurt, and how fast the damage number rises
+    IFRAME_TIME = 0.5
+    DAMAGE_RISE = 60
+
+    #   Colour period of the title text
+    TITLE_PERIOD = 0.25
+
+    #   Delay before the sniper upgrade appears
+    SNIPER_DELAY = 1 / 12
+
 
 ##  ----------------------------------------------- ##
                 ##  Initialization   ##
@@ -49,13 +64,10 @@ class Engine:
         self.spawnRate = spawnRate
         self.maxEnemies = 20
 
-        ##  Text
-        self.textRow = 0
-        self.textTimer = 0.0
-        
-        ##  Frames
-        self.iFrames = 0
-        self.frameCounter = 0
+        ##  Timers
+        self.iFrameTimer = 0.0
+        self.titleTimer = 0.0
+        self.sniperTimer = 0.0
         self.title_row = 0
 
         ##  Spawning
@@ -73,14 +85,14 @@ class Engine:
         #   ------------------- #
         #     Drawable Objects  #
 
-        ##  Title Screen
-        #self.title_text = SysFont("Garamond", 36).render("War And Keys", False, (200,0,0))
-        #self.title = SysFont("Garamond", 16).render("Press any button", False, (255,255,255))
-        self.title = transform.scale(SpriteManager.getInstance().getSprite("title.png"), RESOLUTION)
-
-        ##  Background and Floor
-        self.background = transform.scale2x(SpriteManager.getInstance().getSprite("bg_1.png"))
+        ##  Images made by loadImages() once they're loaded
+        self.loaded = False
+        self.title = None
+        self.background = None
+        self.pauseImage = None
+        self.player = None
 
+        ##  Floor
         self.floor = Surface((RESOLUTION[0], FLOOR))
         self.floor.fill((255,255,255))
         self.floor.fill((0,0,0), Rect(1,1,RESOLUTION[0]-2,FLOOR - 2))
@@ -93,12 +105,6 @@ class Engine:
         ##  Pause Screen
         self.flash = Surface(vec(*RESOLUTION))
         self.flash.set_alpha(100)
-        self.pauseImage = Drawable((RESOLUTION[0]//2 - 60//2, RESOLUTION[1]//2 - 16//2), "pause.png")
-
-        ##  Player
-        self.player = Animated((16*3, RESOLUTION[1] - (FLOOR + 32)), "player_1.png")
-        self.player.addState("shooting", fileName="player_2.png", nFrames=3, fps=16)
-        
         
         ##  Fade
         self.fade = Surface(vec(*RESOLUTION))
@@ -113,19 +119,75 @@ class Engine:
         
         ##  Damage
         self.damage = 0
-        self.damageY = self.player.position[1] - 24
+        self.damageY = 0
 
         ##  Kill Count
         self.killed = 0
 
+        ##  HUD
+        self.hud = Hud()
+
 
         #   ------------------- #
         #     Data Structures   #
 
-        self.enemies = [] # List containing the enemies
+        self.enemyStore = EnemyStore() # Movement state of the enemies, as arrays
+        self.enemies = self.enemyStore.entities # List containing the enemies
+        self.targets = {} # Maps each string to the enemies that can be killed with it
+        self.trie = PrefixTrie() # Prefix trie over the targets, following the keyBuffer
         self.keyBuffer = [] # List containing the player's current string
         self.text = [] # List containing text obtained from the enemy
-        self.bullets = [] # List containing bullets
+        self.bulletStore = BulletStore() # Bullet movement and targets, as arrays
+        self.bullets = self.bulletStore.entities # List containing bullets
+        self.queue = RenderQueue() # Batches the sprite blits of each frame
+
+        ##  Spawn lanes, each tracking its newest enemy
+        self.lanes = {"ground": SpawnLane("ground", Walker),
+                      "air": SpawnLane("air", Flyer)}
+
+        ##  Images are ready now unless they're still being preloaded
+        if not SpriteManager.getInstance().isLoading():
+            self.loadImages()
+
+
+    def loadImages(self):
+        """
+        Make the objects that need the preloaded images.
+        """
+        ##  Title Screen
+        #self.title_text = SysFont("Garamond", 36).render("War And Keys", False, (200,0,0))
+        #self.title = SysFont("Garamond", 16).render("Press any button", False, (255,255,255))
+        self.title = SpriteManager.getInstance().getScaled("title.png", tuple(map(int, RESOLUTION)), "nearest")
+
+        ##  Background
+        self.background = SpriteManager.getInstance().getScaled("bg_1.png", 2)
+
+        ##  Pause Screen
+        self.pauseImage = Drawable((RESOLUTION[0]//2 - 60//2, RESOLUTION[1]//2 - 16//2), "pause.png")
+
+        ##  Player
+        self.player = Animated((16*3, RESOLUTION[1] - (FLOOR + 32)), "player_1.png")
+        self.player.addState("shooting", fileName="player_2.png", nFrames=3, fps=16)
+        self.damageY = self.player.position[1] - 24
+
+        self.loaded = True
+
+    def finishLoading(self):
+        """
+        Finish the images decoded since the last call,
+        and once they're all done, make the scaled ones
+        and the objects that need them.
+        Returns True once the engine is loaded.
+        """
+        if self.loaded:
+            return True
+
+        manager = SpriteManager.getInstance()
+        if not manager.finishPreload():
+            return False
+        manager.prewarm()
+        self.loadImages()
+        return True
 
 
 ##  ----------------------------------------------- ##
@@ -158,33 +220,85 @@ class Engine:
         """
         if len(self.keyBuffer) > 0:
             del self.keyBuffer[-1]
+            self.trie.pop()
 
-    def spawn(self, force = False):
+    def spawn(self, lane = None):
         """
-        Spawn an enemy.
+        Spawn an enemy in a lane,
+        or in a random lane if none is given.
         """
-        rand = randint(0,1)
-        
-        if rand == 0:
-            e = Walker(WordManager.getCommon())
-        elif rand == 1:
-            e = Flyer(WordManager.getCommon())
-        else:
-            e = Walker(WordManager.getCommon())
+        if lane == None:
+            lane = list(self.lanes)[randint(0, len(self.lanes) - 1)]
+
+        e = self.lanes[lane].enemyClass(WordManager.getCommon())
 
         if self.sniping:
             e.snipe()
 
-        self.enemies.append(e)
+        self.addEnemy(e)
+        self.lanes[lane].occupy(e)
     
     def spawnSniper(self):
         """
         Spawn a sniper upgrade.
         """
         e = Sniper()
-        self.enemies.append(e)
+        self.addEnemy(e)
+        self.lanes["ground"].occupy(e)
         self.upgradeReady = False
 
+    def addEnemy(self, e):
+        """
+        Add an enemy to the game
+        and index it by its string.
+        """
+        self.enemyStore.add(e)
+        self.indexTarget(e)
+
+    def indexTarget(self, e):
+        """
+        Make an enemy targetable by its string.
+        """
+        self.targets.setdefault(e.string, []).append(e)
+        self.trie.insert(e.string, e)
+
+    def unindexTarget(self, e):
+        """
+        Stop an enemy from being targeted.
+        """
+        bucket = self.targets.get(e.string)
+        if bucket and e in bucket:
+            bucket.remove(e)
+            if not bucket:
+                del self.targets[e.string]
+            self.trie.remove(e.string, e)
+
+    def findTarget(self, string):
+        """
+        Return the enemy the string would kill, or None.
+        If several enemies share the string,
+        the one closest to the player wins.
+        """
+        bucket = self.targets.get(string)
+        if not bucket:
+            return None
+
+        target = None
+        for e in bucket:
+            if e.dying or e.dead or (e.attacking and e.attack_done):
+                continue
+            if target == None or e.position[0] < target.position[0]:
+                target = e
+        return target
+
+    def killEnemy(self, e):
+        """
+        Start an enemy's death
+        and stop targeting it.
+        """
+        self.unindexTarget(e)
+        e.kill()
+
     def playSFX(self, fileName):
         """
         Play a sound effect.
@@ -200,7 +314,21 @@ class Engine:
         self.inTitle = False
         self.fade_on = True
         self.starting = True
-        self.frameCounter = 0
+        self.sniperTimer = 0.0
+    
+    def enterGame(self):
+        """
+        Skip the title screen, fades,
+        and countdown and start playing.
+        """
+        self.inTitle = False
+        self.inGame = True
+        self.starting = False
+        self.fade_on = False
+        self.fade_off = False
+        self.fade_alpha = 0
+        self.fade.set_alpha(0)
+        self.spawnTimer = 0.0
     
     def hurt(self, damage):
         """
@@ -232,15 +360,15 @@ class Engine:
                 self.backSpace()
                 EventManager.buffBackspace()
 
-            for key in EventManager.queue:
+            while EventManager.queue:
+                key = EventManager.queue.pop(0)
                 if len(self.keyBuffer) == 0:
                         self.playSFX("text_1.wav")
                         self.keyBuffer.append(chr(key).upper())
                 else:
                     self.playSFX("text_1.wav")
                     self.keyBuffer.append(chr(key))
-
-                del EventManager.queue[0]
+                self.trie.push(self.keyBuffer[-1])
 
     
     def submitString(self):
@@ -248,26 +376,27 @@ class Engine:
         Try to damage an enemy
         using the player's current string.
         """
-        for e in self.enemies:
+        e = self.findTarget(''.join(self.keyBuffer))
 
-            if e.string == ''.join(self.keyBuffer) and not (e.dying or e.dead or (e.attacking and e.attack_done)):
+        if e != None:
 
-                ##  Sniper Enemy Killed
-                if e.type == "snipe":
-                    self.playSFX("text_2.wav")
-                    self.snipe()
-                    self.player.play_animation("shooting")
-                    e.kill()
+            ##  Sniper Enemy Killed
+            if e.type == "snipe":
+                self.playSFX("text_2.wav")
+                self.killEnemy(e)
+                self.snipe()
+                self.player.play_animation("shooting")
 
-                ##  Regular Enemy Killed
-                else:
-                    self.playSFX("text_2.wav")
-                    self.player.play_animation("shooting")
-                    self.bullets.append(Bullet(vec(self.player.position[0] + 16, self.player.position[1]), e))
-                    self.playSFX("death.wav")
+            ##  Regular Enemy Killed
+            else:
+                self.playSFX("text_2.wav")
+                self.player.play_animation("shooting")
+                self.bulletStore.add(Bullet(vec(self.player.position[0] + 16, self.player.position[1]), e))
+                self.playSFX("death.wav")
 
-                self.keyBuffer = []
-                return
+            self.keyBuffer = []
+            self.trie.reset()
+            return
         self.playSFX("text_3.wav")
 
     def snipe(self):
@@ -277,17 +406,47 @@ class Engine:
         killed with 1 key press.
         """
         self.sniping = True
+        self.targets = {}
+        self.trie = PrefixTrie()
+        for char in self.keyBuffer:
+            self.trie.push(char)
         for e in self.enemies:
             e.snipe()
+            if not (e.dying or e.dead):
+                self.indexTarget(e)
+            
+
+    def step(self, seconds, keys = ""):
+        """
+        Advance the game by one tick
+        without reading events or drawing.
+
+        Params:
+        seconds -> length of the tick
+        keys    -> characters typed during the tick.
+                   " " submits the buffer, "\b" deletes a character
+        """
+        for key in keys:
+            if key == " ":
+                self.handleKey()
+                self.submitString()
+            elif key == "\b":
+                self.handleKey()
+                self.backSpace()
+            else:
+                EventManager.queue.append(ord(key.lower()))
+        self.handleKey()
+        self.update(seconds)
             
 
     ##  ----------------------------------------------- ##
                     ##  Drawing   ##
 
-    def draw(self, drawSurf):
+    def draw(self, drawSurf, alpha = 1.0):
         """
         Blit all the drawable objects
         to the drawSurf.
+        alpha -> how far between the last two ticks to draw moving objects
         """
         if self.inTitle:
 
@@ -301,45 +460,57 @@ class Engine:
             #drawSurf.blit(title, (RESOLUTION[0] // 2 - title_len * 2, 64))
             
             #   Press any button
-            press, press_len = WordManager.buildText("Press any Button", row + 8, scale=True )
-            drawSurf.blit(press, (RESOLUTION[0] // 2 - press_len, 180))
+            press = WordManager.buildCycle("Press any Button", 8, scale=True)
+            drawSurf.blit(press.getSurface(row), (RESOLUTION[0] // 2 - press.getLength(), 180))
             
         
             
 
         elif self.inGame:
+            #   Interpolate positions
+            self.enemyStore.interpolate(alpha)
+            self.bulletStore.interpolate(alpha)
+
             #   Background - First
             self.drawBackground(drawSurf)
             
             #   Floor
             self.drawFloor(drawSurf)
             
+            #   Sprites, queued and drawn in one batch
+            queue = self.queue.begin(drawSurf)
+
             #   Bullets
             for b in self.bullets:
-                b.draw(drawSurf)
+                b.draw(queue)
 
-            #   Enemies
+            #   Enemies, highlighting the typed prefix
+            matches = self.trie.getMatches()
+            depth = self.trie.getDepth()
             for e in self.enemies:
-                e.draw(drawSurf)
+                e.draw(queue, highlight = depth if e in matches else 0)
 
             #   Player
-            self.player.draw(drawSurf)
+            self.player.draw(queue)
 
             #   Current Text Buffer
-            text, length = WordManager.buildText(''.join(self.keyBuffer), self.textRow + 4)
-            drawSurf.blit(text, (8, self.player.position[1] - 24))
+            text = WordManager.buildCycle(''.join(self.keyBuffer), 4)
+            queue.blit(text.getSurface(WordManager.TEXT_PHASE), (8, self.player.position[1] - 24))
+
+            queue.flush()
 
             #   Damage
             if self.hurting:
                 self.drawDamage(drawSurf)
 
             #   HUD
-            drawSurf.blit(HudBuilder.getHud(self.hp, self.maxHp, self.killed), (8,16))
+            self.hud.update(self.hp, self.maxHp, self.killed)
+            self.hud.draw(drawSurf, (8,16))
             
             if self.sniping:
                 snipe_time, snipe_len = WordManager.buildText(str(int(self.snipeTimer)), 8)
                 
-                drawSurf.blit(snipe_time, vec(32, 256))
+                drawSurf.blit(snipe_time, Vec2(32, 256))
 
             #   Ready / Go
             if self.starting:
@@ -352,7 +523,7 @@ class Engine:
                         self.sound_int += 1
 
                     surf, x = WordManager.buildText("Ready?", 2, scale = True)
-                    drawSurf.blit(surf, vec(RESOLUTION[0] // 2 - x // 2, RESOLUTION[1] // 2 - 8))
+                    drawSurf.blit(surf, Vec2(RESOLUTION[0] // 2 - x // 2, RESOLUTION[1] // 2 - 8))
 
                 elif self.spawnTimer > 0.5 and self.spawnTimer < 0.55:
                     return
@@ -362,7 +533,7 @@ class Engine:
                         self.playSFX("Go.wav")
                         self.sound_int = 0
                     surf, x = WordManager.buildText("GO!", 6, scale = True)
-                    drawSurf.blit(surf, vec(RESOLUTION[0] // 2 - x // 2, RESOLUTION[1] // 2 - 8))
+                    drawSurf.blit(surf, Vec2(RESOLUTION[0] // 2 - x // 2, RESOLUTION[1] // 2 - 8))
                     pass
 
             #   Pause
@@ -411,44 +582,40 @@ class Engine:
 
         #   Fading On
         if self.fade_on:
-            self.fade_alpha += 5
+            self.fade_alpha += Engine.FADE_SPEED * seconds
             if self.fade_alpha >= 255:
                 self.fade_alpha = 255
                 self.fade.set_alpha(255)
                 self.fade_on = False
             else:
-                self.fade.set_alpha(self.fade_alpha)
+                self.fade.set_alpha(int(self.fade_alpha))
         
         #   Fading Off
         elif self.fade_off:
-            self.fade_alpha -= 5
+            self.fade_alpha -= Engine.FADE_SPEED * seconds
             if self.fade_alpha <= 0:
                 self.fade.set_alpha(0)
                 self.fade_alpha = 0
                 self.fade_off = False
             else:
-                self.fade.set_alpha(self.fade_alpha)
+                self.fade.set_alpha(int(self.fade_alpha))
 
     def update_spawn(self, seconds):
-        #   Spawn an enemy if the text won't overlap
-        spawn = True
-        for e in self.enemies:
-            if e.position[0] >= RESOLUTION[0] - e.getLength():
-                spawn = False
-                break
+        #   Spawn an enemy in a lane where the text won't overlap
+        free = [name for name, lane in self.lanes.items() if lane.isClear(self.enemyStore)]
         
-        if spawn:
+        if free:
             self.spawnTimer += seconds
             if self.spawnTimer >= self.spawnRate:
                 self.spawnTimer = 0.0
-                self.spawn()
+                self.spawn(free[randint(0, len(free) - 1)])
 
         #   Spawn a sniper upgrade
-        if not self.sniping and self.upgradeReady and self.frameCounter == 5:
-            self.spawnSniper()
-            self.frameCounter = 0
-        else:
-            self.frameCounter += 1
+        if not self.sniping and self.upgradeReady:
+            self.sniperTimer += seconds
+            if self.sniperTimer >= Engine.SNIPER_DELAY:
+                self.spawnSniper()
+                self.sniperTimer = 0.0
       
 
             
@@ -473,15 +640,19 @@ class Engine:
         
         #   Update Title Text
         if self.inTitle:
-            self.frameCounter += 1
+            self.titleTimer += seconds
 
-            if self.frameCounter == 15:
-                self.frameCounter = 0
+            if self.titleTimer >= Engine.TITLE_PERIOD:
+                self.titleTimer = 0.0
                 self.title_row += 1
                 self.title_row %= 4
 
         #   Update in-game
         if self.inGame:
+
+            #   Remember positions for interpolation
+            self.enemyStore.snapshot()
+            self.bulletStore.snapshot()
             
             #   Ready / Go!
             if self.starting:
@@ -510,18 +681,16 @@ class Engine:
             
             #   Update Player
             self.player.update(seconds)
-            self.textTimer += seconds
-            if self.textTimer >= 0.2:
-                self.textRow += 1
-                self.textRow %= 4
-                self.textTimer = 0.0
+
+            #   Cycle text colours
+            WordManager.updateClock(seconds)
 
             #   Update I-frames
             if self.hurting:
-                self.iFrames += 1
-                self.damageY -= 1
-                if self.iFrames == 30:
-                    self.iFrames = 0
+                self.iFrameTimer += seconds
+                self.damageY -= Engine.DAMAGE_RISE * seconds
+                if self.iFrameTimer >= Engine.IFRAME_TIME:
+                    self.iFrameTimer = 0.0
                     self.hurting = False
                     self.damage = 0
                     self.damageY = 0
@@ -529,43 +698,40 @@ class Engine:
             #   Update Bullets
             for b in self.bullets:
                 b.update(seconds)
-                ##  Kill Enemy
-                for e in self.enemies:
-                    if b.enemy == e and b.position[0] >= e.position[0]:
-                        self.killed += 1
-                        e.kill()
-                        self.bullets.pop(self.bullets.index(b))
+
+            ##  Kill Enemies
+            for e in self.bulletStore.update(seconds, self.enemyStore):
+                if not e.dying:
+                    self.killed += 1
+                    self.killEnemy(e)
                 
+            #   Move Enemies
+            self.enemyStore.update(seconds, self.player.position[0] + self.player.getSize()[0])
+
             #   Update Enemies
             damage = 0
             if self.enemies:
                 for e in self.enemies:
-                    if e.dead:
-                        del self.enemies[self.enemies.index(e)]
-                        for b in self.bullets:
-                            if b.enemy == e:
-                                del self.bullets[self.bullets.index(b)]
-                                break
-                            
-
-                    elif e.attacking:
-                        if e.attack_done:
-                            damage = e.getDamage()
-                            self.hurt(damage)
-                            self.damage = damage
-                            e.attack_done = False
-                        else:
-                            e.update(seconds)
-                    else:
-                        e.update(seconds)
+                    e.update(seconds)
 
-                        #    Check if enemy is attacking the player
-                        if e.position[0] <= self.player.position[0] + self.player.getSize()[0]:
-                            if not e.dying:
-                                e.attack()
+                    ##  Deal the damage of an attack that landed,
+                    ##  even if the enemy finished in the same tick
+                    if e.attack_done:
+                        damage = e.getDamage()
+                        self.hurt(damage)
+                        self.damage = damage
+                        e.attack_done = False
+
+                    if e.dead:
+                        self.unindexTarget(e)
+                        self.enemyStore.discard(e)
 
             #   Spawn Enemies
             self.update_spawn(seconds)
+
+            #   Remove dead enemies and spent bullets
+            self.enemyStore.flush()
+            self.bulletStore.flush()
         
 
         #   Change state once the title screen 
@@ -0,0 +1,41 @@
+from utils import RESOLUTION
+
+"""
+Tracks the spawn edge of each lane enemies enter from.
+"""
+
+class SpawnLane(object):
+    """
+    A lane enemies enter from the right edge of the screen.
+    Enemies in a lane move left at the same speed, so the
+    most recently spawned one is always the rightmost.
+    Checking whether its text still covers the spawn edge
+    is enough to know if the lane is free.
+    """
+
+    def __init__(self, name, enemyClass):
+        self.name = name
+        self.enemyClass = enemyClass
+
+        ##  Handle of the lane's newest enemy
+        self.last = None
+
+    def occupy(self, e):
+        """
+        Record an enemy that just entered the lane.
+        """
+        self.last = e._handle
+
+    def isClear(self, store):
+        """
+        True if a new enemy's text won't overlap the newest one's.
+        """
+        if self.last == None:
+            return True
+
+        e = store.get(self.last)
+        if e == None:
+            self.last = None
+            return True
+
+        return e.position[0] < RESOLUTION[0] - e.getLength()
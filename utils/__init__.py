@@ -1,2 +1,6 @@
 from .vector import *
-from .constants import *
\ No newline at end of file
+from .constants import *
+from .cache import *
+from .trie import *
+from .loop import *
+from .allocTracker import *
\ No newline at end of file
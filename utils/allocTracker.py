@@ -0,0 +1,212 @@
+import os
+import sys
+from collections import deque
+import numpy as np
+import pygame
+import pygame.sysfont
+
+"""
+Opt-in allocation tracking.
+
+AllocTracker.install() wraps the places the game makes Surfaces,
+fonts, and NumPy arrays, and counts each one against the game function
+that asked for it. endFrame() closes a frame's counts, which are kept
+for a rolling summary.
+
+Only allocations made through the wrapped calls are seen: NumPy
+temporaries from arithmetic like a - b, and Surface methods like copy()
+on plain Surfaces, aren't counted.
+"""
+
+#   Game code lives under here; anything else is a library
+GAME_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _TrackedSurface(pygame.Surface):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        AllocTracker.record("Surface", AllocTracker.surfaceBytes(self))
+
+
+class _TrackedFont(pygame.font.Font):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        AllocTracker.record("Font", 0)
+
+    def render(self, *args, **kwargs):
+        surf = super().render(*args, **kwargs)
+        AllocTracker.record("Surface", AllocTracker.surfaceBytes(surf))
+        return surf
+
+
+class AllocTracker(object):
+    """
+    Counts Surface, font, and NumPy allocations per frame,
+    by kind and by the game function that made them.
+    """
+
+    #   Functions that return a new Surface
+    SURFACE_FUNCTIONS = [(pygame.transform, name) for name in
+                         ("scale", "scale2x", "smoothscale", "scale_by", "rotate", "rotozoom", "flip")] + \
+                        [(pygame.image, name) for name in ("load", "frombuffer", "fromstring")]
+
+    #   Functions that return a new array
+    ARRAY_FUNCTIONS = [(np, name) for name in
+                       ("array", "zeros", "empty", "ones", "full", "concatenate", "stack", "clip", "where")]
+
+    #   Number of frames kept for the summary
+    WINDOW = 600
+
+    installed = False
+    frame = {}
+    frames = deque(maxlen = WINDOW)
+    _patches = []
+
+    def surfaceBytes(surf):
+        return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def getSite():
+        """
+        Return module.function of the game code
+        that made the current allocation.
+        """
+        frame = sys._getframe(1)
+        while frame:
+            module = frame.f_globals.get("__name__", "")
+            ##  Skip helpers like vec() to find who called them
+            if frame.f_code.co_filename.startswith(GAME_ROOT) and not module.startswith("utils"):
+                return f"{module}.{frame.f_code.co_name}"
+            frame = frame.f_back
+        return "other"
+
+    def record(kind, nbytes):
+        if not AllocTracker.installed:
+            return
+        key = (kind, AllocTracker.getSite())
+        entry = AllocTracker.frame.get(key)
+        if entry:
+            entry[0] += 1
+            entry[1] += nbytes
+        else:
+            AllocTracker.frame[key] = [1, nbytes]
+
+    def wrapSurfaceFunction(function):
+        def tracked(*args, **kwargs):
+            surf = function(*args, **kwargs)
+            ##  Scaling into a given dest doesn't allocate
+            if not any(surf is arg for arg in args) and not any(surf is arg for arg in kwargs.values()):
+                AllocTracker.record("Surface", AllocTracker.surfaceBytes(surf))
+            return surf
+        return tracked
+
+    def wrapArrayFunction(function):
+        def tracked(*args, **kwargs):
+            array = function(*args, **kwargs)
+            if isinstance(array, np.ndarray):
+                ##  Writing into out= or an argument doesn't allocate
+                out = kwargs.get("out")
+                given = args + tuple(kwargs.values()) + (out if isinstance(out, tuple) else ())
+                if not any(array is arg for arg in given):
+                    AllocTracker.record("ndarray", array.nbytes)
+            return array
+        return tracked
+
+    def patch(owner, name, replacement):
+        original = getattr(owner, name)
+        AllocTracker._patches.append((owner, name, original))
+        setattr(owner, name, replacement)
+        return original
+
+    def install():
+        """
+        Start tracking. Call as early as possible;
+        names the game already imported are rebound too.
+        """
+        if AllocTracker.installed:
+            return
+
+        replaced = {}
+        replaced[id(pygame.Surface)] = _TrackedSurface
+        AllocTracker.patch(pygame, "Surface", _TrackedSurface)
+        replaced[id(pygame.font.Font)] = _TrackedFont
+        AllocTracker.patch(pygame.font, "Font", _TrackedFont)
+        AllocTracker.patch(pygame.sysfont, "Font", _TrackedFont)
+
+        for owner, name in AllocTracker.SURFACE_FUNCTIONS:
+            if hasattr(owner, name):
+                original = getattr(owner, name)
+                replaced[id(original)] = AllocTracker.wrapSurfaceFunction(original)
+                AllocTracker.patch(owner, name, replaced[id(original)])
+
+        for owner, name in AllocTracker.ARRAY_FUNCTIONS:
+            original = getattr(owner, name)
+            replaced[id(original)] = AllocTracker.wrapArrayFunction(original)
+            AllocTracker.patch(owner, name, replaced[id(original)])
+
+        #   Rebind names like `from pygame import Surface` in game modules
+        for module in list(sys.modules.values()):
+            path = getattr(module, "__file__", None) or ""
+            if not path.startswith(GAME_ROOT) or path == __file__:
+                continue
+            for name, value in list(vars(module).items()):
+                if id(value) in replaced:
+                    AllocTracker.patch(module, name, replaced[id(value)])
+
+        AllocTracker.frame = {}
+        AllocTracker.frames.clear()
+        AllocTracker.installed = True
+
+    def uninstall():
+        """Stop tracking and put everything back."""
+        for owner, name, original in reversed(AllocTracker._patches):
+            setattr(owner, name, original)
+        AllocTracker._patches = []
+        AllocTracker.installed = False
+
+    def endFrame():
+        """
+        Close the current frame.
+        Returns its report: (kind, site) -> [count, bytes].
+        """
+        report = AllocTracker.frame
+        AllocTracker.frames.append(report)
+        AllocTracker.frame = {}
+        return report
+
+    def getSummary():
+        """
+        Return allocations per frame over the kept frames,
+        by kind and by (kind, site), busiest first.
+        """
+        nFrames = len(AllocTracker.frames) or 1
+        sites = {}
+        for report in AllocTracker.frames:
+            for key, (count, nbytes) in report.items():
+                total = sites.setdefault(key, [0, 0])
+                total[0] += count
+                total[1] += nbytes
+
+        kinds = {}
+        for (kind, site), (count, nbytes) in sites.items():
+            total = kinds.setdefault(kind, [0, 0])
+            total[0] += count
+            total[1] += nbytes
+
+        perFrame = lambda totals: {"count": totals[0] / nFrames, "bytes": totals[1] / nFrames}
+        return {"frames": len(AllocTracker.frames),
+                "kinds": {kind: perFrame(total) for kind, total in kinds.items()},
+                "sites": {f"{kind} {site}": perFrame(total) for (kind, site), total in
+                          sorted(sites.items(), key = lambda item: -item[1][0])}}
+
+    def formatSummary(top = 15):
+        """
+        Return the summary as a printable table.
+        """
+        summary = AllocTracker.getSummary()
+        lines = [f"Allocations per frame over {summary['frames']} frames"]
+        for kind, stats in summary["kinds"].items():
+            lines.append(f"  {kind:<10} {stats['count']:10.2f} {stats['bytes'] / 1024:10.1f} KiB")
+        lines.append("Busiest sites")
+        for site, stats in list(summary["sites"].items())[:top]:
+            lines.append(f"  {site:<56} {stats['count']:10.2f} {stats['bytes'] / 1024:10.1f} KiB")
+        return "\n".join(lines)
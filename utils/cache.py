@@ -0,0 +1,96 @@
+from collections import OrderedDict
+
+class LRUCache(object):
+    """
+    A bounded least-recently-used cache.
+    Keeps hit, miss, and eviction counters.
+
+    By default it holds up to maxSize entries. Given sizeOf,
+    it holds up to maxSize total size instead, like a byte budget.
+    Pinned keys are never evicted.
+    """
+
+    def __init__(self, maxSize = 256, sizeOf = None):
+        self.maxSize = maxSize
+        self.sizeOf = sizeOf
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self.used = 0
+        self.pinned = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getitem__(self, key):
+        """Return a cached value without counting or reordering it."""
+        return self._entries[key]
+
+    def get(self, key, default = None):
+        """
+        Return the cached value and mark it as recently used.
+        Counts a hit or a miss.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used
+        unpinned entries if the cache is full.
+        The value just stored is never evicted.
+        """
+        self.pop(key)
+        size = self.sizeOf(value) if self.sizeOf else 1
+        self._entries[key] = value
+        self._sizes[key] = size
+        self.used += size
+
+        while self.used > self.maxSize:
+            oldest = next((k for k in self._entries if k not in self.pinned and k != key), None)
+            if oldest == None:
+                break
+            self.pop(oldest)
+            self.evictions += 1
+
+    def pop(self, key, default = None):
+        """Remove and return a value, without counting it."""
+        if key not in self._entries:
+            return default
+        self.used -= self._sizes.pop(key)
+        return self._entries.pop(key)
+
+    def pin(self, key):
+        """Never evict key, whether or not it's cached yet."""
+        self.pinned.add(key)
+
+    def unpin(self, key):
+        self.pinned.discard(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self.used = 0
+
+    def resetStats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def getStats(self):
+        """Return the cache's counters as a dict."""
+        return {"size": len(self._entries),
+                "used": self.used,
+                "maxSize": self.maxSize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions}
@@ -3,4 +3,21 @@ from . import vec
 RESOLUTION = vec(640 // 1.2, 360 // 1.2)
 SCALE = 1
 UPSCALED = RESOLUTION * SCALE
-FLOOR = 26
\ No newline at end of file
+FLOOR = 26
+
+#   Simulation ticks per second, and the frame rate cap (0 for uncapped)
+TICK_RATE = 60
+FRAME_RATE = 60
+
+#   Redraw only what changed each frame instead of the whole screen
+DIRTY_RECTS = False
+
+#   How the frame gets onto the window: "direct", "nearest", or "scale2x"
+#   (py -m UI.presenter measures each one)
+PRESENT_MODE = "direct"
+
+#   Count Surface, font, and array allocations per frame (see AllocTracker)
+TRACK_ALLOCS = False
+
+#   Print frame and tick times every few seconds (see GameLoop.getStats)
+SHOW_TIMINGS = False
\ No newline at end of file
@@ -0,0 +1,107 @@
+import time
+from collections import deque
+
+class GameLoop(object):
+    """
+    A fixed-timestep loop scheduler.
+
+    Each frame, the real time since the last frame is added to an
+    accumulator, and ticks() yields one fixed step for every whole
+    tick in it. What's left over is alpha, the fraction of a tick
+    to interpolate positions by when drawing.
+    Frame and tick times are kept for the last few seconds.
+    """
+
+    #   Longest frame the simulation will catch up on, in seconds
+    MAX_FRAME = 0.25
+
+    def __init__(self, tickRate = 60, frameRate = 0, window = 600):
+        """
+        tickRate  -> simulation ticks per second
+        frameRate -> frames per second to cap at, 0 for uncapped
+        window    -> number of frames and ticks kept for stats
+        """
+        self.tickRate = tickRate
+        self.frameRate = frameRate
+        self.dt = 1 / tickRate
+
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.last = None
+        self.frameStart = None
+
+        self.window = window
+        self.frameTimes = deque(maxlen = window)
+        self.tickTimes = deque(maxlen = window)
+
+    def beginFrame(self):
+        """
+        Start a frame and add the time since the last one
+        to the accumulator.
+        """
+        now = time.perf_counter()
+        if self.last != None:
+            elapsed = now - self.last
+            self.frameTimes.append(elapsed)
+            self.accumulator += min(elapsed, GameLoop.MAX_FRAME)
+        self.last = now
+        self.frameStart = now
+
+    def reset(self):
+        """
+        Forget the time since the last frame, so a long
+        pause like loading isn't caught up on as ticks.
+        """
+        self.last = None
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def ticks(self):
+        """
+        Yield the fixed tick length once per tick owed,
+        timing each tick, then update alpha.
+        """
+        while self.accumulator >= self.dt:
+            start = time.perf_counter()
+            yield self.dt
+            self.tickTimes.append(time.perf_counter() - start)
+            self.accumulator -= self.dt
+
+        self.alpha = self.accumulator / self.dt
+
+    def getSleep(self):
+        """
+        Return how long to wait to hold the frame rate cap.
+        """
+        if not self.frameRate:
+            return 0
+        return max(0, 1 / self.frameRate - (time.perf_counter() - self.frameStart))
+
+    def summarize(times):
+        """
+        Return min, avg, and p99 of some times in milliseconds.
+        """
+        if not times:
+            return {"min": 0.0, "avg": 0.0, "p99": 0.0}
+        ordered = sorted(times)
+        return {"min": ordered[0] * 1000,
+                "avg": sum(ordered) / len(ordered) * 1000,
+                "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000}
+
+    def getStats(self):
+        """
+        Return frame and tick time stats in milliseconds,
+        and the measured frame rate.
+        """
+        frame = GameLoop.summarize(self.frameTimes)
+        return {"frame": frame,
+                "tick": GameLoop.summarize(self.tickTimes),
+                "fps": 1000 / frame["avg"] if frame["avg"] else 0.0}
+
+    def formatStats(self):
+        """
+        Return the stats as a printable line.
+        """
+        stats = self.getStats()
+        times = lambda name: " ".join(f"{key} {value:.2f}" for key, value in stats[name].items())
+        return f"{stats['fps']:.1f} fps | frame ms: {times('frame')} | tick ms: {times('tick')}"
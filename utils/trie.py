@@ -0,0 +1,94 @@
+class PrefixTrie(object):
+    """
+    A trie of strings with a typing cursor.
+    Each node holds every item whose string passes through it,
+    so the items matching the typed prefix are one lookup away.
+    push and pop move the cursor one character in O(1).
+    """
+
+    class _Node(object):
+        __slots__ = ("children", "items")
+
+        def __init__(self):
+            self.children = {}
+            self.items = set()
+
+    def __init__(self):
+        self.root = PrefixTrie._Node()
+
+        #   Cursor: the typed characters and the node reached after each.
+        #   A node is None once the prefix matches nothing.
+        self.prefix = []
+        self.path = [self.root]
+
+    def insert(self, string, item):
+        """Add an item under its string."""
+        node = self.root
+        node.items.add(item)
+        for char in string:
+            node = node.children.setdefault(char, PrefixTrie._Node())
+            node.items.add(item)
+
+        ##  The cursor may have been past the end of the trie
+        if self.path[-1] == None:
+            self._rewalk()
+
+    def remove(self, string, item):
+        """Remove an item from its string, pruning empty branches."""
+        node = self.root
+        nodes = [node]
+        for char in string:
+            node = node.children.get(char)
+            if node == None:
+                break
+            nodes.append(node)
+
+        pruned = False
+        for i, node in enumerate(nodes):
+            node.items.discard(item)
+            if i > 0 and not node.items:
+                del nodes[i - 1].children[string[i - 1]]
+                pruned = True
+                break
+
+        if pruned:
+            self._rewalk()
+
+    def push(self, char):
+        """Advance the cursor by one typed character."""
+        node = self.path[-1]
+        self.prefix.append(char)
+        self.path.append(node.children.get(char) if node != None else None)
+
+    def pop(self):
+        """Move the cursor back one character."""
+        if self.prefix:
+            self.prefix.pop()
+            self.path.pop()
+
+    def reset(self):
+        """Move the cursor back to the empty prefix."""
+        self.prefix = []
+        self.path = [self.root]
+
+    def getDepth(self):
+        """Number of characters typed."""
+        return len(self.prefix)
+
+    def getMatches(self):
+        """
+        Return the set of items whose string
+        starts with the typed prefix.
+        """
+        node = self.path[-1]
+        if node == None or not self.prefix:
+            return set()
+        return node.items
+
+    def _rewalk(self):
+        """Rebuild the cursor's path after the trie changed under it."""
+        node = self.root
+        self.path = [node]
+        for char in self.prefix:
+            node = node.children.get(char) if node != None else None
+            self.path.append(node)
@@ -1,18 +1,130 @@
+import math
+import operator
 import numpy as np
 from pygame import Rect
 
 def vec(*args):
     return np.array((args)).astype(float)
 
+
+class Vec2(object):
+    """
+    A 2D vector of two floats.
+    Much cheaper than a NumPy array for one-off math like
+    draw positions and offsets; keep vec() for anything
+    stored in or batched through an ArrayStore.
+    Indexes, unpacks, and does arithmetic like a vec(), and
+    mixing it with a NumPy array gives a NumPy array.
+    """
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x = 0.0, y = 0.0):
+        self.x = float(x)
+        self.y = float(y)
+
+    def __len__(self):
+        return 2
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __getitem__(self, i):
+        if i == 0 or i == -2:
+            return self.x
+        if i == 1 or i == -1:
+            return self.y
+        raise IndexError("Vec2 index out of range")
+
+    def __setitem__(self, i, value):
+        if i == 0 or i == -2:
+            self.x = float(value)
+        elif i == 1 or i == -1:
+            self.y = float(value)
+        else:
+            raise IndexError("Vec2 index out of range")
+
+    def __array__(self, dtype = None, copy = None):
+        return np.array((self.x, self.y), dtype = dtype or float)
+
+    def __repr__(self):
+        return f"Vec2({self.x}, {self.y})"
+
+    def __eq__(self, other):
+        try:
+            return len(other) == 2 and self.x == other[0] and self.y == other[1]
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def copy(self):
+        return Vec2(self.x, self.y)
+
+    ##  Arithmetic with a number, a Vec2, or a pair.
+    ##  NumPy arrays go through NumPy.
+    def _apply(self, other, op):
+        if isinstance(other, np.ndarray):
+            return NotImplemented
+        if isinstance(other, (int, float, np.number)):
+            return Vec2(op(self.x, other), op(self.y, other))
+        return Vec2(op(self.x, other[0]), op(self.y, other[1]))
+
+    def _reflect(self, other, op):
+        if isinstance(other, (int, float, np.number)):
+            return Vec2(op(other, self.x), op(other, self.y))
+        return Vec2(op(other[0], self.x), op(other[1], self.y))
+
+    def __add__(self, other):
+        return self._apply(other, operator.add)
+
+    def __sub__(self, other):
+        return self._apply(other, operator.sub)
+
+    def __mul__(self, other):
+        return self._apply(other, operator.mul)
+
+    def __truediv__(self, other):
+        return self._apply(other, operator.truediv)
+
+    def __floordiv__(self, other):
+        return self._apply(other, operator.floordiv)
+
+    def __radd__(self, other):
+        return self._reflect(other, operator.add)
+
+    def __rsub__(self, other):
+        return self._reflect(other, operator.sub)
+
+    def __rmul__(self, other):
+        return self._reflect(other, operator.mul)
+
+    def __rtruediv__(self, other):
+        return self._reflect(other, operator.truediv)
+
+    def __neg__(self):
+        return Vec2(-self.x, -self.y)
+
+    def __abs__(self):
+        return Vec2(abs(self.x), abs(self.y))
+
+
 def normalize(vector):
-    """Normalize a numpy array."""
+    """Normalize a numpy array or Vec2."""
     mag = magnitude(vector)
+    if isinstance(vector, Vec2):
+        if mag == 0.0:
+            return Vec2(1, 0)
+        return Vec2(vector.x / mag, vector.y / mag)
     if mag == 0.0:
         return np.array((1,0,0)).astype(float)
     return vector / mag
    
 def magnitude(vector):    
     """Give the magnitude of a vector."""
+    if isinstance(vector, Vec2):
+        return math.hypot(vector.x, vector.y)
     return np.linalg.norm(vector)
 
 def scale(vector, length):